@@ -1,3 +1,7 @@
+import sys
+import time
+import numpy as np
+
 def simple_hash(input_string):
     hash_value = 0  # Алғашқы хэш мәні
     prime = 31      # Кіші жай сан, хэштің тұрақтылығын қамтамасыз ету үшін
@@ -8,8 +12,71 @@ def simple_hash(input_string):
     
     return hash_value
 
+# Көптеген жолдарды NumPy арқылы бірге хэштеу
+BATCH_CHUNK = 65536  # Бір массивке салынатын жолдар саны
+BATCH_CELLS = 1 << 24  # Толықтырылған массивтің ең көп ұяшық саны (uint32, 64 MiB)
+MIN_VECTOR_ROWS = 32  # Бұдан аз (өте ұзын) жолдар бағандар циклінсіз, қарапайым циклмен хэштеледі
+
+def _simple_hash_array(strings):
+    """simple_hash-пен бірдей uint32 нәтижелерді массив ретінде қайтарады"""
+    results = np.empty(len(strings), dtype=np.uint32)
+    all_lengths = np.fromiter((len(s) for s in strings), dtype=np.int64, count=len(strings))
+    # Жолдар ұзындығы бойынша топталады: бір ұзын жол бүкіл топтың толықтыру енін үлкейтпейді
+    order = np.argsort(all_lengths, kind="stable")
+    sorted_lengths = all_lengths[order]
+    start = 0
+    while start < len(order):
+        window = sorted_lengths[start:start + BATCH_CHUNK]
+        # Ұяшық саны (жолдар * ең үлкен ұзындық) BATCH_CELLS-тен аспайтын ең үлкен топ
+        cells = window * np.arange(1, len(window) + 1)
+        size = max(1, int(np.searchsorted(cells, BATCH_CELLS, side="right")))
+        indices = order[start:start + size]
+        lengths = window[:size]
+        start += size
+        if size < MIN_VECTOR_ROWS:
+            for i in indices.tolist():
+                hash_value = 0
+                for char in strings[i]:
+                    hash_value = (hash_value * 31 + ord(char)) % (2**32)
+                results[i] = hash_value
+            continue
+        chunk = [strings[i] for i in indices.tolist()]
+        width = int(lengths[-1])
+        codes = np.frombuffer("".join(chunk).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        # Жолдар оң жаққа тураланады: басындағы нөлдер хэшті өзгертпейді (0 * 31 + 0 = 0)
+        padded = np.zeros((len(chunk), width), dtype=np.uint32)
+        rows = np.repeat(np.arange(len(chunk)), lengths)
+        ends = np.cumsum(lengths)
+        cols = np.arange(len(codes)) - np.repeat(ends - lengths, lengths) + np.repeat(width - lengths, lengths)
+        padded[rows, cols] = codes
+        hash_values = np.zeros(len(chunk), dtype=np.uint32)
+        prime = np.uint32(31)
+        for column in padded.T:
+            hash_values = hash_values * prime + column  # uint32 арифметикасы өзі 2**32 бойынша қиылады
+        results[indices] = hash_values  # Нәтижелер бастапқы ретке қайтарылады
+    return results
+
+def simple_hash_many(strings):
+    """simple_hash(s) нәтижелерінің тізімі, бірақ бүкіл топ үшін бір рет есептеледі"""
+    return _simple_hash_array(list(strings)).tolist()
+
+def benchmark_simple_hash(count=100000, length=64):
+    """Скаляр цикл мен топтық нұсқаның жылдамдығын салыстыру"""
+    strings = [f"record-{i}-" + "x" * length for i in range(count)]
+    start = time.perf_counter()
+    expected = [simple_hash(s) for s in strings]
+    scalar_time = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = simple_hash_many(strings)
+    batch_time = time.perf_counter() - start
+    assert actual == expected
+    print(f"scalar: {scalar_time:.3f}s, batch: {batch_time:.3f}s, speedup: {scalar_time / batch_time:.1f}x")
+
 # Тест
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_simple_hash()
+        sys.exit(0)
     test_string = "Hello, World!"
     print(f"Input string: {test_string}")
     print(f"Hash value: {simple_hash(test_string)}")
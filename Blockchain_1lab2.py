@@ -1,18 +1,29 @@
 import time
+import numpy as np
 
 # Қарапайым блок құрылымы
 class Block:
+    __slots__ = ("index", "timestamp", "data", "previous_hash", "_data_key", "_data_hash", "hash")
+
     def __init__(self, index, timestamp, data, previous_hash=""):
         self.index = index  # Блоктың реттік нөмірі
         self.timestamp = timestamp  # Уақыт таңбасы
         self.data = data  # Блоктың деректері
         self.previous_hash = previous_hash  # Алдыңғы блоктың хэші
+        self._data_key = None  # data-ның соңғы хэштелген мәні (сол объектіге сілтеме)
+        self._data_hash = 0  # Оның simple_hash мәні (бүтін сан)
         self.hash = self.calculate_hash()  # Ағымдағы блоктың хэші
 
     def calculate_hash(self):
-        # Блок хэшін есептеу үшін қарапайым хэш алгоритмі
-        content = str(self.index) + self.timestamp + self.data + self.previous_hash
-        return simple_hash(content)  # Жоғарыда жазылған `simple_hash` функциясын қолданамыз
+        # Тек ұзын болуы мүмкін data өрісінің хэші сақталады; қысқа өрістер әр жолы қайта хэштеледі
+        digest = RollingHash.of(str(self.index) + self.timestamp)
+        return digest.concat(self.data_hash()).append(self.previous_hash).hex()
+
+    def data_hash(self):
+        if self._data_key is None or self._data_key != self.data:
+            self._data_key = self.data
+            self._data_hash = RollingHash.of(self.data).value
+        return RollingHash(self._data_hash, len(self.data))
 
 
 # Генезис блогын құру функциясы
@@ -28,6 +39,84 @@ def simple_hash(input_string):
         hash_value = (hash_value * prime + ord(char)) % (2**32)
     return hex(hash_value)  # Хэшті он алтылық форматта беру
 
+# Көптеген жолдарды NumPy арқылы бірге хэштеу
+BATCH_CHUNK = 65536  # Бір массивке салынатын жолдар саны
+BATCH_CELLS = 1 << 24  # Толықтырылған массивтің ең көп ұяшық саны (uint32, 64 MiB)
+MIN_VECTOR_ROWS = 32  # Бұдан аз (өте ұзын) жолдар бағандар циклінсіз, қарапайым циклмен хэштеледі
+
+def _simple_hash_array(strings):
+    """simple_hash-пен бірдей uint32 нәтижелерді массив ретінде қайтарады"""
+    results = np.empty(len(strings), dtype=np.uint32)
+    all_lengths = np.fromiter((len(s) for s in strings), dtype=np.int64, count=len(strings))
+    # Жолдар ұзындығы бойынша топталады: бір ұзын жол бүкіл топтың толықтыру енін үлкейтпейді
+    order = np.argsort(all_lengths, kind="stable")
+    sorted_lengths = all_lengths[order]
+    start = 0
+    while start < len(order):
+        window = sorted_lengths[start:start + BATCH_CHUNK]
+        # Ұяшық саны (жолдар * ең үлкен ұзындық) BATCH_CELLS-тен аспайтын ең үлкен топ
+        cells = window * np.arange(1, len(window) + 1)
+        size = max(1, int(np.searchsorted(cells, BATCH_CELLS, side="right")))
+        indices = order[start:start + size]
+        lengths = window[:size]
+        start += size
+        if size < MIN_VECTOR_ROWS:
+            for i in indices.tolist():
+                hash_value = 0
+                for char in strings[i]:
+                    hash_value = (hash_value * 31 + ord(char)) % (2**32)
+                results[i] = hash_value
+            continue
+        chunk = [strings[i] for i in indices.tolist()]
+        width = int(lengths[-1])
+        codes = np.frombuffer("".join(chunk).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        # Жолдар оң жаққа тураланады: басындағы нөлдер хэшті өзгертпейді (0 * 31 + 0 = 0)
+        padded = np.zeros((len(chunk), width), dtype=np.uint32)
+        rows = np.repeat(np.arange(len(chunk)), lengths)
+        ends = np.cumsum(lengths)
+        cols = np.arange(len(codes)) - np.repeat(ends - lengths, lengths) + np.repeat(width - lengths, lengths)
+        padded[rows, cols] = codes
+        hash_values = np.zeros(len(chunk), dtype=np.uint32)
+        prime = np.uint32(31)
+        for column in padded.T:
+            hash_values = hash_values * prime + column  # uint32 арифметикасы өзі 2**32 бойынша қиылады
+        results[indices] = hash_values  # Нәтижелер бастапқы ретке қайтарылады
+    return results
+
+def simple_hash_many(strings):
+    """simple_hash(s) нәтижелерінің тізімі, бірақ бүкіл топ үшін бір рет есептеледі"""
+    return [hex(value) for value in _simple_hash_array(list(strings)).tolist()]
+
+
+# Құрамды (rolling) хэш: h(a + b) = h(a) * 31^len(b) + h(b) mod 2^32
+class RollingHash:
+    __slots__ = ("value", "length")
+    PRIME = 31
+    MODULUS = 2**32
+
+    def __init__(self, value=0, length=0):
+        self.value = value  # Жолдың simple_hash мәні (бүтін сан)
+        self.length = length  # Хэштелген символдар саны
+
+    @classmethod
+    def of(cls, text):
+        return cls().append(text)
+
+    def append(self, text):
+        """Жолдың соңына мәтін қосу, тек жаңа символдар ғана өңделеді"""
+        hash_value = self.value
+        for char in text:
+            hash_value = (hash_value * self.PRIME + ord(char)) % self.MODULUS
+        return RollingHash(hash_value, self.length + len(text))
+
+    def concat(self, other):
+        """Екі дайын хэшті қайта сканерлемей біріктіру"""
+        shift = pow(self.PRIME, other.length, self.MODULUS)
+        return RollingHash((self.value * shift + other.value) % self.MODULUS, self.length + other.length)
+
+    def hex(self):
+        return hex(self.value)
+
 
 # Тест
 if __name__ == "__main__":
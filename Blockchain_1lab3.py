@@ -1,24 +1,53 @@
+import sys
 import time
+import tracemalloc
+from types import SimpleNamespace
+import numpy as np
 
 # Блок құрылымы
 class Block:
+    __slots__ = ("index", "timestamp", "data", "previous_hash", "_data_key", "_data_hash", "_hash")
+
     def __init__(self, index, timestamp, data, previous_hash=""):
         self.index = index  # Блоктың реттік нөмірі
         self.timestamp = timestamp  # Уақыт таңбасы
         self.data = data  # Блоктың деректері
         self.previous_hash = previous_hash  # Алдыңғы блоктың хэші
+        self._data_key = None  # data-ның соңғы хэштелген мәні (сол объектіге сілтеме)
+        self._data_hash = 0  # Оның simple_hash мәні (бүтін сан)
         self.hash = self.calculate_hash()  # Ағымдағы блоктың хэші
 
+    # 32 биттік хэш жол емес, бүтін сан ретінде сақталады
+    @property
+    def hash(self):
+        return hex(self._hash)
+
+    @hash.setter
+    def hash(self, value):
+        self._hash = int(value, 16)
+
     def calculate_hash(self):
-        # Хэшті есептеу үшін жоғарыда қарастырылған қарапайым хэш алгоритмі қолданылады
-        content = str(self.index) + self.timestamp + self.data + self.previous_hash
-        return simple_hash(content)
+        # Тек ұзын болуы мүмкін data өрісінің хэші сақталады; қысқа өрістер әр жолы қайта хэштеледі
+        digest = RollingHash.of(str(self.index) + self.timestamp)
+        return digest.concat(self.data_hash()).append(self.previous_hash).hex()
+
+    def data_hash(self):
+        if self._data_key is None or self._data_key != self.data:
+            self._data_key = self.data
+            self._data_hash = RollingHash.of(self.data).value
+        return RollingHash(self._data_hash, len(self.data))
+
+
+# Әр CHECKPOINT_INTERVAL блок сайын сенімді бақылау нүктесі сақталады
+CHECKPOINT_INTERVAL = 1000
 
 
 # Блокчейн құрылымы
 class Blockchain:
     def __init__(self):
         self.chain = [self.create_genesis_block()]  # Генезис блогы тізбектің басталуы
+        self.validated_height = 0  # Осы биіктікке дейін тізбек тексерілген
+        self.checkpoints = []  # (биіктік, хэш) жұптары
 
     def create_genesis_block(self):
         return Block(0, time.ctime(), "Genesis Block", "0")
@@ -31,23 +60,55 @@ class Blockchain:
         new_block.previous_hash = self.get_latest_block().hash
         new_block.hash = new_block.calculate_hash()
         self.chain.append(new_block)
-
-    def is_chain_valid(self):
+        self.advance_watermark()
+
+    def advance_watermark(self):
+        # Жаңа блок тексерілген тізбектің үстіне қосылса және өзі дұрыс болса (O(1)), белгі бір блокқа жылжиды
+        height = len(self.chain) - 1
+        block = self.chain[height]
+        if (
+            self.validated_height == height - 1
+            and block.previous_hash == self.chain[height - 1].hash
+            and block.hash == block.calculate_hash()
+        ):
+            self.validated_height = height
+            if height % CHECKPOINT_INTERVAL == 0:
+                self.checkpoints.append((height, self.chain[height].hash))
+
+    def nearest_checkpoint(self):
+        """Хэші әлі сәйкес келетін ең жоғары бақылау нүктесінің биіктігі"""
+        for height, block_hash in reversed(self.checkpoints):
+            if height < len(self.chain) and self.chain[height].hash == block_hash:
+                return height
+        return 0
+
+    def is_chain_valid(self, incremental=False, from_checkpoint=False):
         # Блокчейннің дұрыстығын тексеру
-        for i in range(1, len(self.chain)):
+        # incremental=True: тек соңғы тексеруден кейін қосылған блоктар тексеріледі
+        # from_checkpoint=True: толық тексеру ең жақын бақылау нүктесінен басталады
+        if incremental:
+            start = min(self.validated_height, len(self.chain) - 1) + 1
+        elif from_checkpoint:
+            start = self.nearest_checkpoint() + 1
+        else:
+            start = 1
+        for i in range(start, len(self.chain)):
             current_block = self.chain[i]
             previous_block = self.chain[i - 1]
 
             # Ағымдағы блоктың хэші дұрыс па?
             if current_block.hash != current_block.calculate_hash():
                 print(f"Block {i} has invalid hash.")
+                self.validated_height = min(self.validated_height, i - 1)
                 return False
 
             # Алдыңғы блоктың хэші дұрыс па?
             if current_block.previous_hash != previous_block.hash:
                 print(f"Block {i} has invalid previous hash.")
+                self.validated_height = min(self.validated_height, i - 1)
                 return False
 
+        self.validated_height = len(self.chain) - 1
         return True
 
 
@@ -59,9 +120,111 @@ def simple_hash(input_string):
         hash_value = (hash_value * prime + ord(char)) % (2**32)
     return hex(hash_value)
 
+# Көптеген жолдарды NumPy арқылы бірге хэштеу
+BATCH_CHUNK = 65536  # Бір массивке салынатын жолдар саны
+BATCH_CELLS = 1 << 24  # Толықтырылған массивтің ең көп ұяшық саны (uint32, 64 MiB)
+MIN_VECTOR_ROWS = 32  # Бұдан аз (өте ұзын) жолдар бағандар циклінсіз, қарапайым циклмен хэштеледі
+
+def _simple_hash_array(strings):
+    """simple_hash-пен бірдей uint32 нәтижелерді массив ретінде қайтарады"""
+    results = np.empty(len(strings), dtype=np.uint32)
+    all_lengths = np.fromiter((len(s) for s in strings), dtype=np.int64, count=len(strings))
+    # Жолдар ұзындығы бойынша топталады: бір ұзын жол бүкіл топтың толықтыру енін үлкейтпейді
+    order = np.argsort(all_lengths, kind="stable")
+    sorted_lengths = all_lengths[order]
+    start = 0
+    while start < len(order):
+        window = sorted_lengths[start:start + BATCH_CHUNK]
+        # Ұяшық саны (жолдар * ең үлкен ұзындық) BATCH_CELLS-тен аспайтын ең үлкен топ
+        cells = window * np.arange(1, len(window) + 1)
+        size = max(1, int(np.searchsorted(cells, BATCH_CELLS, side="right")))
+        indices = order[start:start + size]
+        lengths = window[:size]
+        start += size
+        if size < MIN_VECTOR_ROWS:
+            for i in indices.tolist():
+                hash_value = 0
+                for char in strings[i]:
+                    hash_value = (hash_value * 31 + ord(char)) % (2**32)
+                results[i] = hash_value
+            continue
+        chunk = [strings[i] for i in indices.tolist()]
+        width = int(lengths[-1])
+        codes = np.frombuffer("".join(chunk).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        # Жолдар оң жаққа тураланады: басындағы нөлдер хэшті өзгертпейді (0 * 31 + 0 = 0)
+        padded = np.zeros((len(chunk), width), dtype=np.uint32)
+        rows = np.repeat(np.arange(len(chunk)), lengths)
+        ends = np.cumsum(lengths)
+        cols = np.arange(len(codes)) - np.repeat(ends - lengths, lengths) + np.repeat(width - lengths, lengths)
+        padded[rows, cols] = codes
+        hash_values = np.zeros(len(chunk), dtype=np.uint32)
+        prime = np.uint32(31)
+        for column in padded.T:
+            hash_values = hash_values * prime + column  # uint32 арифметикасы өзі 2**32 бойынша қиылады
+        results[indices] = hash_values  # Нәтижелер бастапқы ретке қайтарылады
+    return results
+
+def simple_hash_many(strings):
+    """simple_hash(s) нәтижелерінің тізімі, бірақ бүкіл топ үшін бір рет есептеледі"""
+    return [hex(value) for value in _simple_hash_array(list(strings)).tolist()]
+
+
+# Құрамды (rolling) хэш: h(a + b) = h(a) * 31^len(b) + h(b) mod 2^32
+class RollingHash:
+    __slots__ = ("value", "length")
+    PRIME = 31
+    MODULUS = 2**32
+
+    def __init__(self, value=0, length=0):
+        self.value = value  # Жолдың simple_hash мәні (бүтін сан)
+        self.length = length  # Хэштелген символдар саны
+
+    @classmethod
+    def of(cls, text):
+        return cls().append(text)
+
+    def append(self, text):
+        """Жолдың соңына мәтін қосу, тек жаңа символдар ғана өңделеді"""
+        hash_value = self.value
+        for char in text:
+            hash_value = (hash_value * self.PRIME + ord(char)) % self.MODULUS
+        return RollingHash(hash_value, self.length + len(text))
+
+    def concat(self, other):
+        """Екі дайын хэшті қайта сканерлемей біріктіру"""
+        shift = pow(self.PRIME, other.length, self.MODULUS)
+        return RollingHash((self.value * shift + other.value) % self.MODULUS, self.length + other.length)
+
+    def hex(self):
+        return hex(self.value)
+
+
+# Жадты өлшеу: бастапқы __dict__ блогы (hex хэш жолымен) мен қазіргі __slots__ блогы
+def _measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+def benchmark_memory(count=100000):
+    """Бір блокқа шаққандағы жад: __dict__ объектілері және __slots__ блоктары"""
+    data = [f"Block {i} Data" for i in range(count)]
+    timestamp = time.ctime()
+    blocks, slotted = _measure(lambda: [Block(i, timestamp, data[i], "0x0") for i in range(count)])
+    fields = ("index", "timestamp", "data", "previous_hash", "hash")
+    _, dict_based = _measure(lambda: [SimpleNamespace(**{name: getattr(block, name) for name in fields}) for block in blocks])
+    print(f"__dict__ objects: {dict_based / count:.0f} B/block")
+    print(f"__slots__ Block: {slotted / count:.0f} B/block")
+
 
 # Тест
 if __name__ == "__main__":
+    if "--bench-memory" in sys.argv:
+        benchmark_memory()
+        sys.exit(0)
+
     # Блокчейнді құру
     blockchain = Blockchain()
 
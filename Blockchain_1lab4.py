@@ -17,10 +17,16 @@ class Block:
         return simple_hash(content)
 
 
+# Әр CHECKPOINT_INTERVAL блок сайын сенімді бақылау нүктесі сақталады
+CHECKPOINT_INTERVAL = 1000
+
+
 # Блокчейн құрылымы
 class Blockchain:
     def __init__(self):
         self.chain = [self.create_genesis_block()]
+        self.validated_height = 0  # Осы биіктікке дейін тізбек тексерілген
+        self.checkpoints = []  # (биіктік, хэш) жұптары
 
     def create_genesis_block(self):
         return Block(0, time.ctime(), "Genesis Block", "0")
@@ -36,20 +42,50 @@ class Blockchain:
             self.get_latest_block().hash,
         )
         self.chain.append(new_block)
-
-    def is_chain_valid(self):
-        for i in range(1, len(self.chain)):
+        self.advance_watermark()
+
+    def advance_watermark(self):
+        # Жаңа блок тексерілген тізбектің үстіне қосылса және өзі дұрыс болса (O(1)), белгі бір блокқа жылжиды
+        height = len(self.chain) - 1
+        block = self.chain[height]
+        if (
+            self.validated_height == height - 1
+            and block.previous_hash == self.chain[height - 1].hash
+            and block.hash == block.calculate_hash()
+        ):
+            self.validated_height = height
+            if height % CHECKPOINT_INTERVAL == 0:
+                self.checkpoints.append((height, self.chain[height].hash))
+
+    def nearest_checkpoint(self):
+        """Хэші әлі сәйкес келетін ең жоғары бақылау нүктесінің биіктігі"""
+        for height, block_hash in reversed(self.checkpoints):
+            if height < len(self.chain) and self.chain[height].hash == block_hash:
+                return height
+        return 0
+
+    def is_chain_valid(self, incremental=False, from_checkpoint=False):
+        if incremental:
+            start = min(self.validated_height, len(self.chain) - 1) + 1
+        elif from_checkpoint:
+            start = self.nearest_checkpoint() + 1
+        else:
+            start = 1
+        for i in range(start, len(self.chain)):
             current_block = self.chain[i]
             previous_block = self.chain[i - 1]
 
             # Тек ағымдағы блоктың хэші дұрыс па?
             if current_block.hash != current_block.calculate_hash():
+                self.validated_height = min(self.validated_height, i - 1)
                 return False
 
             # Алдыңғы блоктың хэші дұрыс па?
             if current_block.previous_hash != previous_block.hash:
+                self.validated_height = min(self.validated_height, i - 1)
                 return False
 
+        self.validated_height = len(self.chain) - 1
         return True
 
 
@@ -62,6 +98,51 @@ def simple_hash(input_string):
     return hex(hash_value)
 
 
+# Виртуал тізім: тізбек қаншалықты ұзын болса да, тек көрінетін жолдар салынады
+class VirtualList(tk.Frame):
+    def __init__(self, master, render_row, width=100, height=20):
+        super().__init__(master)
+        self.render_row = render_row  # жол нөмірі -> мәтін
+        self.count = 0
+        self.top = 0  # Терезедегі бірінші жолдың нөмірі
+        self.height = height
+        self.listbox = tk.Listbox(self, width=width, height=height)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scroll)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.bind("<MouseWheel>", lambda event: self.scroll_to(self.top - event.delta // 120))
+        self.listbox.bind("<Button-4>", lambda event: self.scroll_to(self.top - 1))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll_to(self.top + 1))
+
+    def set_count(self, count):
+        """Жолдар санын жаңарту; терезе соңында тұрса, жаңа жолдарға ілеседі"""
+        at_end = self.top + self.height >= self.count
+        self.count = count
+        if at_end:
+            self.top = max(0, count - self.height)
+        self.refresh()
+
+    def refresh(self):
+        self.listbox.delete(0, tk.END)
+        for row in range(self.top, min(self.count, self.top + self.height)):
+            self.listbox.insert(tk.END, self.render_row(row))
+        if self.count:
+            self.scrollbar.set(self.top / self.count, min(1.0, (self.top + self.height) / self.count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, top):
+        self.top = max(0, min(top, self.count - self.height))
+        self.refresh()
+
+    def on_scroll(self, action, *args):
+        if action == tk.MOVETO:
+            self.scroll_to(int(float(args[0]) * self.count))
+        elif action == tk.SCROLL:
+            step = self.height if args[1] == tk.PAGES else 1
+            self.scroll_to(self.top + int(args[0]) * step)
+
+
 # Блокчейн GUI
 class BlockchainExplorer:
     def __init__(self, root):
@@ -86,7 +167,7 @@ class BlockchainExplorer:
         )
         self.validate_button.pack(pady=10)
 
-        self.block_list = tk.Listbox(self.root, width=100, height=20)
+        self.block_list = VirtualList(self.root, self.render_block, width=100, height=20)
         self.block_list.pack(pady=10)
 
         # Генезис блогын көрсету
@@ -103,7 +184,8 @@ class BlockchainExplorer:
         self.data_entry.delete(0, tk.END)
 
     def validate_chain(self):
-        if self.blockchain.is_chain_valid():
+        # Соңғы бақылау нүктесінен кейінгі блоктар қайта тексеріледі: өзгертілген блоктар да табылады
+        if self.blockchain.is_chain_valid(from_checkpoint=True):
             messagebox.showinfo("Blockchain Validation", "The blockchain is valid!")
         else:
             messagebox.showerror(
@@ -111,17 +193,18 @@ class BlockchainExplorer:
             )
 
     def update_block_list(self):
-        self.block_list.delete(0, tk.END)  # Блок тізімін тазалау
-
-        for block in self.blockchain.chain:
-            block_info = (
-                f"Index: {block.index}, "
-                f"Timestamp: {block.timestamp}, "
-                f"Data: {block.data}, "
-                f"Hash: {block.hash}, "
-                f"Previous Hash: {block.previous_hash}"
-            )
-            self.block_list.insert(tk.END, block_info)
+        # Тек жолдар саны жаңарады, көрінетін терезе ғана қайта салынады
+        self.block_list.set_count(len(self.blockchain.chain))
+
+    def render_block(self, row):
+        block = self.blockchain.chain[row]
+        return (
+            f"Index: {block.index}, "
+            f"Timestamp: {block.timestamp}, "
+            f"Data: {block.data}, "
+            f"Hash: {block.hash}, "
+            f"Previous Hash: {block.previous_hash}"
+        )
 
 
 # Негізгі бағдарлама
@@ -1,40 +1,226 @@
 import sys
+import time
 import hashlib
-from PyQt6.QtWidgets import QApplication, QMainWindow, QPushButton, QTextEdit, QVBoxLayout, QWidget
+import tracemalloc
+import multiprocessing
+from types import SimpleNamespace
+from array import array
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtWidgets import QApplication, QMainWindow, QPushButton, QLabel, QListView, QVBoxLayout, QWidget
 
 # Транзакция моделі
 class Transaction:
+    __slots__ = ("sender", "receiver", "amount", "fee", "tx_digest", "outpoint_digest")
+
     def __init__(self, sender, receiver, amount, fee):
         self.sender = sender
         self.receiver = receiver
         self.amount = amount
         self.fee = fee
-        self.tx_hash = self.calculate_hash()
+        self.tx_digest = self.calculate_digest()  # Хэш 32 байт ретінде сақталады
+        self.outpoint_digest = None
 
-    def calculate_hash(self):
+    def calculate_digest(self):
         data = f"{self.sender}{self.receiver}{self.amount}{self.fee}"
-        return hashlib.sha256(data.encode()).hexdigest()
+        return hashlib.sha256(data.encode()).digest()
+
+    def calculate_hash(self):
+        return self.calculate_digest().hex()
+
+    @property
+    def tx_hash(self):
+        return self.tx_digest.hex()
+
+    @property
+    def outpoint_hash(self):
+        return self.outpoint_digest.hex() if self.outpoint_digest is not None else None
 
 # Меркле ағашы
+HASH_SIZE = 32  # SHA-256 дайджестінің байт ұзындығы
+
+def _merkle_parent(left, right):
+    # Түйіндер hex жолдарының қосындысы ретінде хэштеледі (түбір бұрынғыдай қалады)
+    return hashlib.sha256((left.hex() + right.hex()).encode()).digest()
+
 class MerkleTree:
     def __init__(self, transactions):
-        self.transactions = transactions
+        self.transactions = list(transactions)
+        self.levels = []  # Әр деңгей 32 байттық дайджесттер тізбегі ретінде bytearray-де сақталады
+        self.leaf_index = {}  # tx_digest -> жапырақ индексі
         self.root = self.build_merkle_root()
 
     def build_merkle_root(self):
-        tx_hashes = [tx.tx_hash for tx in self.transactions]
-        if not tx_hashes:
+        level = bytearray()
+        for i, tx in enumerate(self.transactions):
+            level += tx.tx_digest
+            self.leaf_index.setdefault(tx.tx_digest, i)
+        if not level:
+            self.levels = []
+            return None
+        self.levels = [level]
+        while len(level) > HASH_SIZE:
+            new_level = bytearray()
+            for i in range(0, len(level), 2 * HASH_SIZE):
+                left = level[i:i + HASH_SIZE]
+                right = level[i + HASH_SIZE:i + 2 * HASH_SIZE] or left  # Егер тақ сан болса, соңғы элементті қайталаймыз
+                new_level += _merkle_parent(left, right)
+            self.levels.append(new_level)
+            level = new_level
+        return level.hex()
+
+    def _node(self, depth, index):
+        level = self.levels[depth]
+        return bytes(level[index * HASH_SIZE:(index + 1) * HASH_SIZE])
+
+    def _level_size(self, depth):
+        return len(self.levels[depth]) // HASH_SIZE
+
+    def append(self, tx):
+        """Жаңа транзакция қосу: тек жапырақтан түбірге дейінгі O(log n) жол жаңартылады"""
+        self.transactions.append(tx)
+        if not self.levels:
+            self.levels = [bytearray()]
+        index = self._level_size(0)
+        self.levels[0] += tx.tx_digest
+        self.leaf_index.setdefault(tx.tx_digest, index)
+        depth = 0
+        while self._level_size(depth) > 1:
+            left_index = index - index % 2
+            left = self._node(depth, left_index)
+            right = self._node(depth, left_index + 1) if left_index + 1 < self._level_size(depth) else left
+            parent = _merkle_parent(left, right)
+            index //= 2
+            if depth + 1 == len(self.levels):
+                self.levels.append(bytearray())
+            upper = self.levels[depth + 1]
+            if index < len(upper) // HASH_SIZE:
+                upper[index * HASH_SIZE:(index + 1) * HASH_SIZE] = parent
+            else:
+                upper += parent
+            depth += 1
+        self.root = self._node(depth, 0).hex()
+        return self.root
+
+    def get_proof(self, tx_hash):
+        """Транзакцияның ағашқа кіретінін дәлелдейтін (көрші хэш, жағы) тізімі"""
+        index = self.leaf_index.get(bytes.fromhex(tx_hash))
+        if index is None:
+            return None
+        proof = []
+        for depth in range(len(self.levels) - 1):
+            sibling_index = index ^ 1
+            if sibling_index >= self._level_size(depth):
+                sibling_index = index
+            side = "left" if sibling_index < index else "right"
+            proof.append((self._node(depth, sibling_index).hex(), side))
+            index //= 2
+        return proof
+
+    @staticmethod
+    def verify_proof(tx_hash, proof, root):
+        """Дәлелді O(log n) хэш арқылы тексеру"""
+        current = bytes.fromhex(tx_hash)
+        for sibling_hex, side in proof:
+            sibling = bytes.fromhex(sibling_hex)
+            if side == "left":
+                current = _merkle_parent(sibling, current)
+            else:
+                current = _merkle_parent(current, sibling)
+        return current.hex() == root
+
+# Ағынды Меркле түбірі: әр деңгейде тек бір күтіп тұрған түйін сақталады (O(log n) жад)
+class StreamingMerkleBuilder:
+    def __init__(self):
+        self.pending = []  # pending[k] - k деңгейіндегі жұбын күтіп тұрған түйін немесе None
+        self.count = 0  # Қосылған жапырақтар саны
+
+    def add_hash(self, leaf):
+        node = leaf
+        for depth in range(len(self.pending)):
+            if self.pending[depth] is None:
+                self.pending[depth] = node
+                break
+            node = _merkle_parent(self.pending[depth], node)
+            self.pending[depth] = None
+        else:
+            self.pending.append(node)
+        self.count += 1
+
+    def add(self, tx):
+        self.add_hash(tx.tx_digest)
+
+    def root(self):
+        """MerkleTree(...).root-пен бірдей түбір (тақ деңгейде соңғы хэш қайталанады)"""
+        if self.count == 0:
             return None
-        while len(tx_hashes) > 1:
-            new_level = []
-            for i in range(0, len(tx_hashes), 2):
-                if i + 1 < len(tx_hashes):
-                    combined = tx_hashes[i] + tx_hashes[i+1]
-                else:
-                    combined = tx_hashes[i] + tx_hashes[i]  # Егер тақ сан болса, соңғы элементті қайталаймыз
-                new_level.append(hashlib.sha256(combined.encode()).hexdigest())
-            tx_hashes = new_level
-        return tx_hashes[0]
+        carry = None  # Төменгі деңгейлерді аяқтағаннан кейінгі осы деңгейдің соңғы түйіні
+        size = self.count
+        depth = 0
+        while size > 1:
+            left = self.pending[depth] if depth < len(self.pending) else None
+            if carry is not None:
+                carry = _merkle_parent(left, carry) if left is not None else _merkle_parent(carry, carry)
+            elif left is not None:
+                carry = _merkle_parent(left, left)
+            size = (size + 1) // 2
+            depth += 1
+        return (carry if carry is not None else self.pending[depth]).hex()
+
+def streaming_merkle_root(transactions):
+    """Транзакциялар итераторынан тізім құрмай Меркле түбірін есептеу"""
+    builder = StreamingMerkleBuilder()
+    for tx in transactions:
+        builder.add(tx)
+    return builder.root()
+
+def _merkle_bench_worker(method, count, results):
+    try:
+        import resource  # Тек Unix жүйелерінде бар
+    except ImportError:
+        resource = None
+        tracemalloc.start()
+    transactions = (Transaction(f"user{i}", "receiver", i, 1) for i in range(count))
+    start = time.perf_counter()
+    if method == "streaming":
+        root = streaming_merkle_root(transactions)
+    else:
+        root = MerkleTree(list(transactions)).root
+    elapsed = time.perf_counter() - start
+    if resource is not None:
+        peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    else:
+        peak_kib = tracemalloc.get_traced_memory()[1] // 1024  # Windows: Python бөлген жадтың шыңы
+    results.put((root, elapsed, peak_kib))
+
+def benchmark_merkle(count=1000000):
+    """Толық ағаш пен ағынды құрастырушының уақыты мен ең жоғары жадын салыстыру (жеке процестерде)"""
+    results = multiprocessing.Queue()
+    for method in ("tree", "streaming"):
+        process = multiprocessing.Process(target=_merkle_bench_worker, args=(method, count, results))
+        process.start()
+        root, elapsed, peak_kib = results.get()
+        process.join()
+        print(f"{method}: {elapsed:.2f}s, peak memory {peak_kib / 1024:.1f} MiB, root {root}")
+
+# Жадты өлшеу: бастапқы __dict__ транзакциясы (hex tx_hash жолымен) мен қазіргі __slots__ транзакциясы
+def _measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+def benchmark_memory(count=100000):
+    """Бір транзакцияға шаққандағы жад: __dict__ объектілері және __slots__ транзакциялары"""
+    senders = [f"user{i}" for i in range(count)]
+    transactions, slotted = _measure(lambda: [Transaction(senders[i], "receiver", i, 1) for i in range(count)])
+    _, dict_based = _measure(lambda: [
+        SimpleNamespace(sender=tx.sender, receiver=tx.receiver, amount=tx.amount, fee=tx.fee, tx_hash=tx.tx_hash)
+        for tx in transactions
+    ])
+    print(f"__dict__ objects: {dict_based / count:.0f} B/transaction")
+    print(f"__slots__ Transaction: {slotted / count:.0f} B/transaction")
 
 # Блок моделі
 class Block:
@@ -48,34 +234,185 @@ class Block:
         data = f"{self.previous_hash}{self.merkle_root}"
         return hashlib.sha256(data.encode()).hexdigest()
 
+# UTXO жиыны: шығыстар (tx_hash, output_index) бойынша индекстеледі, өрістер массивтерде сақталады
+GENESIS_BALANCES = {"Alice": 100, "Bob": 100, "Charlie": 100, "Dave": 100}
+
+class UTXOSet:
+    def __init__(self):
+        self.tx_hashes = bytearray()  # Әр слотқа 32 байт
+        self.output_indexes = array("I")
+        self.amounts = array("d")
+        self.owner_ids = array("I")
+        self.free_slots = []  # Жұмсалған шығыстардан босаған слоттар
+        self.slots = {}  # outpoint кілті (36 байт) -> слот
+        self.owner_names = []
+        self.owner_lookup = {}  # иесінің аты -> id
+        self.owner_slots = []  # id -> иесінің жұмсалмаған слоттары
+        self.balances = array("d")  # id -> баланс
+
+    @staticmethod
+    def outpoint(tx_hash, output_index):
+        return tx_hash + output_index.to_bytes(4, "little")
+
+    def _owner_id(self, owner):
+        owner_id = self.owner_lookup.get(owner)
+        if owner_id is None:
+            owner_id = len(self.owner_names)
+            self.owner_lookup[owner] = owner_id
+            self.owner_names.append(owner)
+            self.owner_slots.append(set())
+            self.balances.append(0)
+        return owner_id
+
+    def add(self, tx_hash, output_index, owner, amount):
+        """Жаңа шығыс қосу, оның outpoint кілтін қайтарады"""
+        key = self.outpoint(tx_hash, output_index)
+        owner_id = self._owner_id(owner)
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.tx_hashes[slot * HASH_SIZE:(slot + 1) * HASH_SIZE] = tx_hash
+            self.output_indexes[slot] = output_index
+            self.amounts[slot] = amount
+            self.owner_ids[slot] = owner_id
+        else:
+            slot = len(self.amounts)
+            self.tx_hashes += tx_hash
+            self.output_indexes.append(output_index)
+            self.amounts.append(amount)
+            self.owner_ids.append(owner_id)
+        self.slots[key] = slot
+        self.owner_slots[owner_id].add(slot)
+        self.balances[owner_id] += amount
+        return key
+
+    def remove(self, key):
+        """Шығысты жұмсау, (иесі, сома) қайтарады"""
+        slot = self.slots.pop(key)
+        owner_id = self.owner_ids[slot]
+        amount = self.amounts[slot]
+        self.owner_slots[owner_id].discard(slot)
+        self.balances[owner_id] -= amount
+        self.free_slots.append(slot)
+        return self.owner_names[owner_id], amount
+
+    def get(self, tx_hash, output_index):
+        """(иесі, сома) немесе шығыс жоқ болса None"""
+        slot = self.slots.get(self.outpoint(bytes.fromhex(tx_hash), output_index))
+        if slot is None:
+            return None
+        return self.owner_names[self.owner_ids[slot]], self.amounts[slot]
+
+    def balance(self, owner):
+        owner_id = self.owner_lookup.get(owner)
+        return 0 if owner_id is None else self.balances[owner_id]
+
+    def has_outputs(self, owner):
+        owner_id = self.owner_lookup.get(owner)
+        return owner_id is not None and bool(self.owner_slots[owner_id])
+
+    def select_outputs(self, owner, needed):
+        """Кемінде needed сомасын жабатын outpoint кілттері (кемінде бір шығыс)"""
+        selected = []
+        total = 0
+        for slot in self.owner_slots[self.owner_lookup[owner]]:
+            selected.append(self.outpoint(bytes(self.tx_hashes[slot * HASH_SIZE:(slot + 1) * HASH_SIZE]), self.output_indexes[slot]))
+            total += self.amounts[slot]
+            if total >= needed:
+                break
+        return selected, total
+
+    def __len__(self):
+        return len(self.slots)
+
 # UTXO моделі
 class Blockchain:
     def __init__(self):
         self.chain = []
-        self.utxo = {"Alice": 100, "Bob": 100, "Charlie": 100, "Dave": 100}
+        self.utxo = UTXOSet()
+        self.undo = []  # Әр блоктың undo журналы: (кілт, иесі, сома), иесі None болса шығыс құрылған
         self.create_genesis_block()
 
     def create_genesis_block(self):
         genesis_block = Block([], "0" * 64)
         self.chain.append(genesis_block)
+        for name, amount in GENESIS_BALANCES.items():
+            self.utxo.add(hashlib.sha256(f"genesis:{name}".encode()).digest(), 0, name, amount)
+        self.undo.append([])
 # Валидация
     def validate_transaction(self, transaction):
-        if transaction.sender not in self.utxo or self.utxo[transaction.sender] < transaction.amount + transaction.fee:
+        if not self.utxo.has_outputs(transaction.sender) or self.utxo.balance(transaction.sender) < transaction.amount + transaction.fee:
             return False
         return True
 
+    def apply_transaction(self, tx, journal):
+        # Жіберушінің шығыстары жұмсалып, алушыға және қайтарымға жаңа шығыстар жасалады
+        keys, total = self.utxo.select_outputs(tx.sender, tx.amount + tx.fee)
+        for key in keys:
+            owner, amount = self.utxo.remove(key)
+            journal.append((key, owner, amount))
+        # Жұмсалған outpoint-тар хэшке кіреді, сондықтан бірдей транзакциялардың шығыстары қайталанбайды
+        outpoint_hash = hashlib.sha256(tx.tx_digest + b"".join(keys)).digest()
+        tx.outpoint_digest = outpoint_hash
+        journal.append((self.utxo.add(outpoint_hash, 0, tx.receiver, tx.amount), None, 0))
+        change = total - tx.amount - tx.fee
+        if change > 0:
+            journal.append((self.utxo.add(outpoint_hash, 1, tx.sender, change), None, 0))
+
     def add_block(self, transactions):
+        journal = []
         for tx in transactions:
             if not self.validate_transaction(tx):
                 print(f"Қате: {tx.sender} үшін баланс жеткіліксіз!")
+                self.rollback(journal)
                 return False
-        for tx in transactions:
-            self.utxo[tx.sender] -= (tx.amount + tx.fee)
-            self.utxo[tx.receiver] = self.utxo.get(tx.receiver, 0) + tx.amount
+            self.apply_transaction(tx, journal)
         new_block = Block(transactions, self.chain[-1].block_hash)
         self.chain.append(new_block)
+        self.undo.append(journal)
         return True
 
+    def rollback(self, journal):
+        # Журнал кері ретпен қайталанады: блок ішінде жұмсалған жаңа шығыстар да дұрыс қалпына келеді
+        for key, owner, amount in reversed(journal):
+            if owner is None:
+                self.utxo.remove(key)
+            else:
+                self.utxo.add(key[:HASH_SIZE], int.from_bytes(key[HASH_SIZE:], "little"), owner, amount)
+
+    def disconnect_block(self):
+        """Соңғы блокты undo жазбасы арқылы O(блок өлшемі) уақытта алып тастау (reorg үшін)"""
+        if len(self.chain) <= 1:
+            return None
+        self.rollback(self.undo.pop())
+        return self.chain.pop()
+
+# Тізбек моделі: QListView тек көрінетін блоктарды сұрайды, жаңа блоктар ғана кірістіріледі
+class ChainModel(QAbstractListModel):
+    def __init__(self, blockchain):
+        super().__init__()
+        self.blockchain = blockchain
+        self.count = 0
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.count
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        block = self.blockchain.chain[index.row()]
+        return (f"Блок хэші: {block.block_hash}\n"
+                f"Алдыңғы хэш: {block.previous_hash}\n"
+                f"Меркле түбірі: {block.merkle_root}")
+    def sync(self):
+        """Модельді тізбек ұзындығына келтіру (disconnect_block кейін жолдар алынады)"""
+        size = len(self.blockchain.chain)
+        if size < self.count:
+            self.beginRemoveRows(QModelIndex(), size, self.count - 1)
+            self.count = size
+            self.endRemoveRows()
+        elif size > self.count:
+            self.beginInsertRows(QModelIndex(), self.count, size - 1)
+            self.count = size
+            self.endInsertRows()
+
 # PyQt GUI
 class BlockchainGUI(QMainWindow):
     def __init__(self):
@@ -85,12 +422,15 @@ class BlockchainGUI(QMainWindow):
     def initUI(self):
         self.setWindowTitle("Blockchain Explorer")
         self.setGeometry(100, 100, 600, 400)
-        self.text_area = QTextEdit(self)
-        self.text_area.setReadOnly(True)
+        self.model = ChainModel(self.blockchain)
+        self.block_view = QListView(self)
+        self.block_view.setUniformItemSizes(True)
+        self.block_view.setModel(self.model)
         self.button = QPushButton("Жаңа блок қосу", self)
         self.button.clicked.connect(self.add_block)
         layout = QVBoxLayout()
-        layout.addWidget(self.text_area)
+        layout.addWidget(QLabel("Blockchain:"))
+        layout.addWidget(self.block_view)
         layout.addWidget(self.button)
         container = QWidget()
         container.setLayout(layout)
@@ -101,13 +441,15 @@ class BlockchainGUI(QMainWindow):
         if self.blockchain.add_block(transactions):
             self.update_display()
     def update_display(self):
-        text = "Blockchain:\n"
-        for block in self.blockchain.chain:
-            text += f"Блок хэші: {block.block_hash}\n"
-            text += f"Алдыңғы хэш: {block.previous_hash}\n"
-            text += f"Меркле түбірі: {block.merkle_root}\n\n"
-        self.text_area.setText(text)
+        self.model.sync()
+        self.block_view.scrollToBottom()
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_merkle()
+        sys.exit(0)
+    if "--bench-memory" in sys.argv:
+        benchmark_memory()
+        sys.exit(0)
     app = QApplication(sys.argv)
     gui = BlockchainGUI()
     gui.show()
@@ -1,5 +1,8 @@
+import os
 import time
 import json
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 from Crypto.PublicKey import RSA
 from Crypto.Signature import pkcs1_15
 from Crypto.Hash import SHA256
@@ -17,6 +20,53 @@ def simple_hash(data: str) -> str:
         hash_value &= 0xFFFFFFFF
     return hex(hash_value)[2:]
 
+def _merkle_parent(left, right):
+    # Түйіндер 32 биттік бүтін сан ретінде сақталады, хэш бұрынғыдай hex жолдарынан алынады
+    return int(simple_hash(format(left, "x") + format(right, "x")), 16)
+
+class StreamingMerkleBuilder:
+    """Әр деңгейде бір күтіп тұрған түйін ғана сақталатын Меркле түбірін құрастырушы"""
+
+    def __init__(self):
+        self.pending = []
+        self.count = 0
+
+    def add(self, tx):
+        node = int(simple_hash(json.dumps(tx)), 16)
+        for depth in range(len(self.pending)):
+            if self.pending[depth] is None:
+                self.pending[depth] = node
+                break
+            node = _merkle_parent(self.pending[depth], node)
+            self.pending[depth] = None
+        else:
+            self.pending.append(node)
+        self.count += 1
+
+    def root(self):
+        """Тақ деңгейдегі соңғы түйін өзгертусіз жоғары көтеріледі"""
+        if self.count == 0:
+            return "0"
+        carry = None
+        size = self.count
+        depth = 0
+        while size > 1:
+            left = self.pending[depth] if depth < len(self.pending) else None
+            if carry is not None and left is not None:
+                carry = _merkle_parent(left, carry)
+            elif carry is None:
+                carry = left
+            size = (size + 1) // 2
+            depth += 1
+        return format(carry if carry is not None else self.pending[depth], "x")
+
+def streaming_merkle_root(transactions):
+    """Транзакциялар итераторынан O(log n) жадпен Меркле түбірін есептеу"""
+    builder = StreamingMerkleBuilder()
+    for tx in transactions:
+        builder.add(tx)
+    return builder.root()
+
 # ----------------- 2. БЛОК ҚҰРЫЛЫМЫ -----------------
 
 class Block:
@@ -29,16 +79,7 @@ class Block:
 
     def calculate_merkle_root(self):
         """Меркле түбірін есептеу"""
-        hashes = [simple_hash(json.dumps(tx)) for tx in self.transactions]
-        while len(hashes) > 1:
-            temp = []
-            for i in range(0, len(hashes), 2):
-                if i + 1 < len(hashes):
-                    temp.append(simple_hash(hashes[i] + hashes[i + 1]))
-                else:
-                    temp.append(hashes[i])
-            hashes = temp
-        return hashes[0] if hashes else "0"
+        return streaming_merkle_root(self.transactions)
 
     def calculate_hash(self):
         """Блок хэшін есептеу"""
@@ -47,6 +88,34 @@ class Block:
 
 # ----------------- 3. БЛОКЧЕЙН -----------------
 
+class BalanceOverlay:
+    """Негізгі баланстар үстіндегі copy-on-write қабаты: тек өзгерген аккаунттар сақталады"""
+
+    def __init__(self, base):
+        self.base = base
+        self.changes = {}
+
+    def __contains__(self, name):
+        return name in self.changes or name in self.base
+
+    def get(self, name, default=0):
+        if name in self.changes:
+            return self.changes[name]
+        return self.base.get(name, default)
+
+    def __getitem__(self, name):
+        if name in self.changes:
+            return self.changes[name]
+        return self.base[name]
+
+    def __setitem__(self, name, value):
+        self.changes[name] = value
+
+    def commit(self):
+        """Өзгерістерді негізгі баланстарға бір мезетте жазу"""
+        self.base.update(self.changes)
+        self.changes = {}
+
 class Blockchain:
     def __init__(self):
         self.chain = [Block([], "0")]
@@ -54,17 +123,19 @@ class Blockchain:
 
     def add_block(self, transactions):
         """Жаңа блок қосу"""
-        if not self.validate_transactions(transactions):
+        balances = BalanceOverlay(self.utxo)
+        if not self.validate_transactions(transactions, balances):
             return False
         previous_block = self.chain[-1]
         new_block = Block(transactions, previous_block.hash)
         self.chain.append(new_block)
-        self.update_balances(transactions)
+        balances.commit()
         return True
 
-    def validate_transactions(self, transactions):
-        """Транзакцияларды тексеру"""
-        balances = self.utxo.copy()
+    def validate_transactions(self, transactions, balances=None):
+        """Транзакцияларды тексеру (balances қабатында блок әсері жиналады)"""
+        if balances is None:
+            balances = BalanceOverlay(self.utxo)
         for tx in transactions:
             sender, recipient, amount = tx["sender"], tx["recipient"], tx["amount"]
             if sender != "SYSTEM":
@@ -74,14 +145,6 @@ class Blockchain:
             balances[recipient] = balances.get(recipient, 0) + amount
         return True
 
-    def update_balances(self, transactions):
-        """UTXO жаңарту"""
-        for tx in transactions:
-            sender, recipient, amount = tx["sender"], tx["recipient"], tx["amount"]
-            if sender != "SYSTEM":
-                self.utxo[sender] -= amount
-            self.utxo[recipient] = self.utxo.get(recipient, 0) + amount
-
 # ----------------- 4. САНДЫҚ ҚОЛТАҢБА ЖӘНЕ АККАУНТТАР -----------------
 
 class Wallet:
@@ -101,13 +164,60 @@ class Wallet:
     def verify_signature(transaction, signature, public_key):
         """Қолтаңбаны тексеру (Ашық кілт арқылы)"""
         h = SHA256.new(json.dumps(transaction).encode())
-        rsa_key = RSA.import_key(public_key)
         try:
+            # Жарамсыз кілт бүкіл топты емес, тек осы элементті қабылдамайды
+            rsa_key = import_public_key(public_key)
             pkcs1_15.new(rsa_key).verify(h, bytes.fromhex(signature))
             return True
-        except ValueError:
+        except (ValueError, TypeError, IndexError):
             return False
 
+# Талданған ашық кілттер шектелген LRU кэште сақталады (әр процестің өз кэші бар)
+KEY_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def import_public_key(public_key):
+    return RSA.import_key(public_key)
+
+def _verify_chunk(items):
+    return [Wallet.verify_signature(tx, signature, public_key) for tx, signature, public_key in items]
+
+class SignatureVerifier:
+    """Қолтаңбаларды топтап, шақырулар арасында сақталатын процестер пулында тексереді"""
+
+    def __init__(self, workers=None, chunk_size=64):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.executor = None
+
+    def verify(self, items):
+        items = list(items)
+        if self.workers == 1 or len(items) <= self.chunk_size:
+            return _verify_chunk(items)
+        # Пул бір рет ашылады: процестерді іске қосу құны мен кілт кэшін қыздыру қайталанбайды
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        results = []
+        for chunk_result in self.executor.map(_verify_chunk, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+_signature_verifiers = {}  # (процестер саны, бөлік өлшемі) -> SignatureVerifier
+
+def verify_signatures(items, workers=None, chunk_size=64):
+    """(tx, signature, public_key) тізімін тексеріп, әр элемент үшін True/False тізімін қайтарады"""
+    key = (workers or os.cpu_count() or 1, chunk_size)
+    verifier = _signature_verifiers.get(key)
+    if verifier is None:
+        verifier = _signature_verifiers[key] = SignatureVerifier(*key)
+    return verifier.verify(items)
+
 # ----------------- 5. ӘМИЯН GUI -----------------
 
 class BlockchainGUI(QWidget):
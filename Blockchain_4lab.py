@@ -1,40 +1,304 @@
+import os
+import sys
 import json
+import asyncio
+import mmap
 import time
+import heapq
+import struct
 import hashlib
 import requests
 import threading
-from flask import Flask, request, jsonify
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from flask import Flask, Response, g, request, jsonify
 from flask_socketio import SocketIO, emit
 import tkinter as tk
 from tkinter import scrolledtext
+from metrics import REGISTRY
 
 app = Flask(__name__)
 socketio = SocketIO(app)
 
+# Блоктар дискіде: қосылатын сегмент файлдары + биіктік -> (сегмент, offset, ұзындық) индексі
+DATA_DIR = os.environ.get("BLOCKCHAIN_DATA_DIR", "chaindata")
+SEGMENT_SIZE = 128 * 1024 * 1024  # Бір сегмент файлының шегі
+INDEX_ENTRY = struct.Struct("<IQI32s")  # сегмент, offset, ұзындық, блоктың SHA-256 дайджесті
+
+class BlockStore:
+    """Тек соңына жазылатын блок қоймасы; денелері mmap арқылы талап бойынша оқылады"""
+
+    def __init__(self, path, segment_size=SEGMENT_SIZE):
+        self.path = path
+        self.segment_size = segment_size
+        os.makedirs(path, exist_ok=True)
+        self.index_file = open(os.path.join(path, "index.dat"), "a+b")
+        # Үзілген жазбаны алып тастау: индекс тек толық жазбалардан тұрады
+        index_size = os.path.getsize(self.index_file.name)
+        self.count = index_size // INDEX_ENTRY.size
+        if index_size % INDEX_ENTRY.size:
+            self.index_file.truncate(self.count * INDEX_ENTRY.size)
+        self.index_map = None
+        self.segment_maps = {}  # сегмент нөмірі -> mmap
+        self.map_lock = threading.Lock()  # mmap-ты қайта ашу мен одан оқу бір уақытта болмайды
+        self.last = None  # (биіктік, блок) - соңғы блоктың кэші
+        self.last_hash = None
+        if self.count:
+            segment, offset, length, digest = self._entry(self.count - 1)
+            end = offset + length
+            self.last_hash = digest.hex()
+        else:
+            segment, end = 0, 0
+        self.segment = segment
+        self.segment_file = open(self._segment_path(segment), "a+b")
+        self.segment_file.truncate(end)  # Индекске енбеген құйрықты тастау
+        self.segment_offset = end
+        # Ауысудан кейін үзілген жазба индекске енбеген келесі сегментті қалдыруы мүмкін
+        stale = segment + 1
+        while os.path.exists(self._segment_path(stale)):
+            os.remove(self._segment_path(stale))
+            stale += 1
+
+    def _segment_path(self, segment):
+        return os.path.join(self.path, f"blk{segment:05d}.dat")
+
+    def _entry(self, height):
+        if self.index_map is None or len(self.index_map) < (height + 1) * INDEX_ENTRY.size:
+            self.index_file.flush()
+            self.index_map = mmap.mmap(self.index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return INDEX_ENTRY.unpack_from(self.index_map, height * INDEX_ENTRY.size)
+
+    def _segment_view(self, segment, end):
+        view = self.segment_maps.get(segment)
+        if view is None or len(view) < end:
+            # append денені индекс жазбасынан бұрын flush етеді, сондықтан индекстегі блок файлда бар
+            with open(self._segment_path(segment), "rb") as f:
+                new_view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if view is not None:
+                view.close()
+            view = self.segment_maps[segment] = new_view
+        return view
+
+    def read_raw(self, height):
+        """Блоктың канондық JSON байттары"""
+        # Кесінді көшірме қайтарады, сондықтан құлыптан кейін ескі mmap жабылса да қауіпсіз
+        with self.map_lock:
+            segment, offset, length, _ = self._entry(height)
+            return self._segment_view(segment, offset + length)[offset:offset + length]
+
+    def block_hash(self, height):
+        """create_block кезінде бір рет есептелген хэш"""
+        if height < 0:
+            height += self.count
+        with self.map_lock:
+            return self._entry(height)[3].hex()
+
+    def append(self, block):
+        data = json.dumps(block, sort_keys=True).encode()
+        if self.segment_offset and self.segment_offset + len(data) > self.segment_size:
+            with self.map_lock:
+                self.segment_file.close()
+                self.segment += 1
+                self.segment_file = open(self._segment_path(self.segment), "w+b")
+            self.segment_offset = 0
+        digest = hashlib.sha256(data).digest()
+        self.segment_file.write(data)
+        self.segment_file.flush()
+        # Индекс жазбасы дене жазылғаннан кейін ғана қосылады
+        self.index_file.write(INDEX_ENTRY.pack(self.segment, self.segment_offset, len(data), digest))
+        self.index_file.flush()
+        self.segment_offset += len(data)
+        # Соңғы блок count жарияланбай тұрып орнатылады: оқырман жаңа ұзындықпен ескі ұшты көрмейді
+        self.last = (self.count, block)
+        self.last_hash = digest.hex()
+        self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, height):
+        if isinstance(height, slice):
+            return [self[i] for i in range(*height.indices(self.count))]
+        if height < 0:
+            height += self.count
+        if not 0 <= height < self.count:
+            raise IndexError("block height out of range")
+        last = self.last
+        if last is not None and last[0] == height:
+            return last[1]
+        block = json.loads(self.read_raw(height))
+        if height == self.count - 1:
+            self.last = (height, block)
+        return block
+
+    def __iter__(self):
+        for height in range(self.count):
+            yield self[height]
+
+    def close(self):
+        for view in self.segment_maps.values():
+            view.close()
+        if self.index_map is not None:
+            self.index_map.close()
+        self.segment_file.close()
+        self.index_file.close()
+
+# Мемпул: комиссия бойынша реттелген, шектелген және ағындар арасында қауіпсіз
+MEMPOOL_SIZE = 50000
+MAX_BLOCK_TRANSACTIONS = 2000
+TX_FIELDS = ('sender', 'receiver', 'amount')
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def transaction_error(tx):
+    """Клиенттен келген транзакцияны тексеру: қате сипаттамасы немесе None"""
+    if not isinstance(tx, dict) or not all(field in tx for field in TX_FIELDS):
+        return 'Missing transaction fields'
+    if not isinstance(tx['sender'], str) or not isinstance(tx['receiver'], str):
+        return "'sender' and 'receiver' must be strings"
+    if not _is_number(tx['amount']) or not _is_number(tx.get('fee', 0)):
+        return "'amount' and 'fee' must be numbers"
+    nonce = tx.get('nonce')
+    if nonce is not None and (not isinstance(nonce, int) or isinstance(nonce, bool)):
+        return "'nonce' must be an integer"
+    return None
+
+class Mempool:
+    def __init__(self, max_size=MEMPOOL_SIZE):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.by_id = {}  # id -> (транзакция, комиссия, рет)
+        self.by_sender = {}  # жіберуші -> {nonce: id}
+        self.best = []  # (-комиссия, рет, id) - блокқа ең тиімдісін алу үшін
+        self.worst = []  # (комиссия, -рет, id) - толған кезде ең арзанын шығару үшін
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.by_id)
+
+    @staticmethod
+    def tx_id(tx):
+        # Канондық JSON-ның хэші (nonce немесе уақыт белгісі де кіреді)
+        return hashlib.sha256(json.dumps(tx, sort_keys=True).encode()).hexdigest()
+
+    def add(self, tx):
+        """Транзакцияны қосу; дәл қайталанса, nonce қайшы келсе немесе тым арзан болса False"""
+        fee = tx.get('fee', 0)
+        nonce = tx.get('nonce')
+        # Индекстер өзгерместен бұрын тексеріледі, әйтпесе үйіндіге енбеген жазба қалады
+        if not _is_number(fee):
+            raise TypeError("fee must be a number")
+        tx_id = self.tx_id(tx)
+        with self.lock:
+            if tx_id in self.by_id:
+                return False  # Дәл сол транзакция қайта жіберілді: O(1)
+            if nonce is not None and nonce in self.by_sender.get(tx['sender'], {}):
+                return False  # Сол жіберушінің сол nonce-ы бар басқа транзакция
+            if len(self.by_id) >= self.max_size:
+                self._drop_stale(self.worst)
+                if not self.worst or self.worst[0][0] >= fee:
+                    return False
+                self._remove(heapq.heappop(self.worst)[2])
+            self.sequence += 1
+            self.by_id[tx_id] = (tx, fee, self.sequence)
+            if nonce is not None:
+                self.by_sender.setdefault(tx['sender'], {})[nonce] = tx_id
+            heapq.heappush(self.best, (-fee, self.sequence, tx_id))
+            heapq.heappush(self.worst, (fee, -self.sequence, tx_id))
+            return True
+
+    def take(self, count):
+        """Комиссиясы ең жоғары count транзакцияны алып, мемпулдан өшіру: O(count log M)"""
+        taken = []
+        with self.lock:
+            while self.best and len(taken) < count:
+                tx_id = heapq.heappop(self.best)[2]
+                if tx_id in self.by_id:
+                    taken.append(self._remove(tx_id))
+            if len(self.best) + len(self.worst) > 4 * len(self.by_id) + 1024:
+                self._compact()
+        return taken
+
+    def discard(self, txs):
+        """Басқа түйін қазған блоктағы транзакцияларды мемпулдан өшіру"""
+        with self.lock:
+            for tx in txs:
+                tx_id = self.tx_id(tx)
+                if tx_id in self.by_id:
+                    self._remove(tx_id)
+
+    def _compact(self):
+        # Ескірген жазбалар тым көбейсе, екі үйінді тірі транзакциялардан қайта құрылады
+        self.best = [(-fee, seq, tx_id) for tx_id, (_, fee, seq) in self.by_id.items()]
+        self.worst = [(fee, -seq, tx_id) for tx_id, (_, fee, seq) in self.by_id.items()]
+        heapq.heapify(self.best)
+        heapq.heapify(self.worst)
+
+    def _remove(self, tx_id):
+        tx = self.by_id.pop(tx_id)[0]
+        nonce = tx.get('nonce')
+        if nonce is not None:
+            nonces = self.by_sender[tx['sender']]
+            del nonces[nonce]
+            if not nonces:
+                del self.by_sender[tx['sender']]
+        return tx
+
+    def _drop_stale(self, heap):
+        # Басқа үйіндіден алынған жазбалар жалқау түрде тазаланады
+        while heap and heap[0][2] not in self.by_id:
+            heapq.heappop(heap)
+
 class Blockchain:
     #Түйіндер
-    def __init__(self):
-        self.chain = []
-        self.transactions = []
+    def __init__(self, data_dir=DATA_DIR):
+        self.chain = BlockStore(data_dir)
+        self.mempool = Mempool()
+        self.lock = threading.RLock()
         self.nodes = set()
-        self.create_block(proof=1, previous_hash='0')
+        if not len(self.chain):
+            self.create_block(proof=1, previous_hash='0')
     def create_block(self, proof, previous_hash):
-        block = {
-            'index': len(self.chain) + 1,
-            'timestamp': time.time(),
-            'transactions': self.transactions,
-            'proof': proof,
-            'previous_hash': previous_hash
-        }
-        self.transactions = []
-        self.chain.append(block)
+        with self.lock:
+            block = {
+                'index': len(self.chain) + 1,
+                'timestamp': time.time(),
+                'transactions': self.mempool.take(MAX_BLOCK_TRANSACTIONS),
+                'proof': proof,
+                'previous_hash': previous_hash
+            }
+            self.chain.append(block)
         return block
-    def add_transaction(self, sender, receiver, amount):
-        self.transactions.append({
+    def mine_next_block(self):
+        # Ұшты оқу мен блок қосу бір құлып ішінде: параллель /mine сұраулары тізбекті бұзбайды
+        with self.lock:
+            proof = self.last_block['proof'] + 1  # Simple PoW example
+            return self.create_block(proof, self.last_hash)
+    def receive_block(self, block):
+        # Пир блогы тек ұшты жалғастырса қосылады; тармақтарды шешу бұл түйінде жоқ
+        with self.lock:
+            if block['index'] != len(self.chain) + 1 or block['previous_hash'] != self.last_hash:
+                return False
+            self.chain.append(block)
+        self.mempool.discard(block['transactions'])
+        return True
+    def add_transaction(self, sender, receiver, amount, fee=0, nonce=None):
+        tx = {
             'sender': sender,
             'receiver': receiver,
-            'amount': amount
-        })
+            'amount': amount,
+            'fee': fee
+        }
+        if nonce is not None:
+            tx['nonce'] = nonce
+        else:
+            # nonce-сыз бірдей төлемдердің id-і әртүрлі болуы үшін сервер уақытын белгілейді;
+            # қайталап жіберуден қорғану үшін клиент nonce жіберуі керек
+            tx['timestamp'] = time.time()
+        if not self.mempool.add(tx):
+            return None
         return self.last_block['index'] + 1
     @staticmethod
     def hash(block):
@@ -42,28 +306,189 @@ class Blockchain:
     @property
     def last_block(self):
         return self.chain[-1]
+    @property
+    def last_hash(self):
+        # Блок қосылғанда сақталған канондық хэш, қайта сериализация жоқ
+        return self.chain.last_hash
+    def is_chain_valid(self, use_cache=True):
+        previous_hash = None
+        for height in range(len(self.chain)):
+            block = self.chain[height]
+            if height and block['previous_hash'] != previous_hash:
+                return False
+            previous_hash = self.chain.block_hash(height) if use_cache else self.hash(block)
+        return True
+
+def benchmark_validation(count=100000, data_dir="bench_chaindata"):
+    """Кэшпен және кэшсіз тізбекті тексеру уақыты"""
+    bench_chain = Blockchain(data_dir)
+    while len(bench_chain.chain) < count:
+        bench_chain.add_transaction('alice', 'bob', len(bench_chain.chain))
+        bench_chain.create_block(len(bench_chain.chain), bench_chain.last_hash)
+    for use_cache in (False, True):
+        start = time.perf_counter()
+        valid = bench_chain.is_chain_valid(use_cache=use_cache)
+        print(f"use_cache={use_cache}: valid={valid}, {time.perf_counter() - start:.2f}s for {count} blocks")
+    bench_chain.chain.close()
+
 blockchain = Blockchain()
 
+# Пирлерге тарату: әр пирге keep-alive сессиясы, параллель жіберу, таймаут және қайталау
+PEER_TIMEOUT = (1.0, 3.0)  # (қосылу, оқу) секундпен
+PEER_RETRIES = 2
+PEER_BACKOFF = 0.2  # Қайталаулар арасындағы кідіріс: backoff * 2**attempt
+LATENCY_WINDOW = 1000  # Пайыздық мәндер үшін сақталатын соңғы өлшемдер
+
+class PeerTransport:
+    def __init__(self, max_workers=16, timeout=PEER_TIMEOUT, retries=PEER_RETRIES, backoff=PEER_BACKOFF):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.sessions = {}  # пир -> requests.Session
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def session(self, peer):
+        with self.lock:
+            session = self.sessions.get(peer)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self.sessions[peer] = session
+            return session
+
+    def post(self, peer, path, payload):
+        """Бір пирге жеткізу: тек 2xx жеткізілді деп саналады; 4xx қайталанбайтын қате,
+        қосылу қатесі, таймаут немесе 5xx болса қайталанады"""
+        session = self.session(peer)
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            try:
+                response = session.post(f'http://{peer}{path}', json=payload, timeout=self.timeout)
+                if 200 <= response.status_code < 300:
+                    self.latencies.append(time.perf_counter() - start)
+                    return True
+                if response.status_code < 500:
+                    return False
+            except requests.exceptions.RequestException:
+                pass
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt)
+        return False
+
+    def broadcast(self, peers, path, payload):
+        """Барлық пирлерге бір уақытта жіберу, {пир: жеткізілді ме} қайтарады"""
+        futures = {peer: self.executor.submit(self.post, peer, path, payload) for peer in peers}
+        return {peer: future.result() for peer, future in futures.items()}
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)):
+        samples = sorted(self.latencies)
+        if not samples:
+            return {}
+        return {f'p{p}': samples[min(len(samples) - 1, int(len(samples) * p / 100))] for p in percentiles}
+
+    def close(self):
+        self.executor.shutdown()
+        for session in self.sessions.values():
+            session.close()
+
+peer_transport = PeerTransport()
+
+# Метрикалар: /metrics бағытында Prometheus форматында беріледі
+TRANSACTIONS_RECEIVED = REGISTRY.counter('node_transactions_received_total', 'Transactions accepted into the mempool')
+TRANSACTIONS_REJECTED = REGISTRY.counter('node_transactions_rejected_total', 'Transactions rejected by the mempool')
+BLOCKS_MINED = REGISTRY.counter('node_blocks_mined_total', 'Blocks created by /mine')
+BROADCAST_SECONDS = REGISTRY.histogram('node_broadcast_block_seconds', 'Duration of broadcast_block fan-out')
+REGISTRY.gauge('node_mempool_transactions', 'Pending transactions in the mempool', function=lambda: len(blockchain.mempool))
+REGISTRY.gauge('node_chain_height', 'Number of blocks in the chain', function=lambda: len(blockchain.chain))
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def observe_request_latency(response):
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    REGISTRY.histogram('node_request_seconds', 'HTTP request latency', {'route': route}).observe(time.perf_counter() - g.request_start)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 # Әмиян интеграциясын қосу. 
 @app.route('/transactions/new', methods=['POST'])
 def new_transaction():
     data = request.get_json()
-    index = blockchain.add_transaction(data['sender'], data['receiver'], data['amount'])
+    error = transaction_error(data)
+    if error:
+        return jsonify({'message': error}), 400
+    index = blockchain.add_transaction(data['sender'], data['receiver'], data['amount'], data.get('fee', 0), data.get('nonce'))
+    if index is None:
+        TRANSACTIONS_REJECTED.inc()
+        return jsonify({'message': 'Transaction rejected'}), 409
+    TRANSACTIONS_RECEIVED.inc()
     return jsonify({'message': f'Transaction added to Block {index}'}), 201
 
 @app.route('/mine', methods=['GET'])
 def mine_block():
-    last_block = blockchain.last_block
-    last_proof = last_block['proof']
-    proof = last_proof + 1  # Simple PoW example
-    previous_hash = blockchain.hash(last_block)
-    block = blockchain.create_block(proof, previous_hash)
+    block = blockchain.mine_next_block()
+    BLOCKS_MINED.inc()
     return jsonify({'message': 'Block Mined', 'block': block}), 200
 
 #Блок Эксплорер жаңарту.
+MAX_CHAIN_PAGE = 1000  # Бір беттегі блоктардың ең көп саны
+
+def stream_chain(length):
+    # Блоктар қоймадағы дайын JSON байттарымен бөліктеп жіберіледі
+    yield b'{"chain": ['
+    for height in range(length):
+        if height:
+            yield b','
+        yield blockchain.chain.read_raw(height)
+    yield f'], "length": {length}}}'.encode()
+
 @app.route('/chain', methods=['GET'])
 def full_chain():
-    return jsonify({'chain': blockchain.chain, 'length': len(blockchain.chain)}), 200
+    length = len(blockchain.chain)
+    start = request.args.get('from', type=int)
+    limit = request.args.get('limit', type=int)
+    # Берілген параметрлер оң бүтін сан болуы керек
+    for name, value in (('from', start), ('limit', limit)):
+        if name in request.args and (value is None or value <= 0):
+            return jsonify({'message': f"'{name}' must be a positive integer"}), 400
+    paged = start is not None or limit is not None
+    start = 1 if start is None else start  # 'from' - блоктың 'index' өрісі (1-ден басталады)
+    limit = MAX_CHAIN_PAGE if limit is None else min(limit, MAX_CHAIN_PAGE)
+    # ETag соңғы блоктың хэшіне және сұралған ауқымға байланысты
+    tip_hash = blockchain.chain.block_hash(length - 1)  # Оқылған ұзындыққа сәйкес ұш
+    etag = f'{tip_hash}-{start}-{limit}' if paged else tip_hash
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    elif paged:
+        blocks = blockchain.chain[start - 1:start - 1 + limit]
+        response = jsonify({'chain': blocks, 'length': length, 'from': start, 'limit': limit})
+    else:
+        response = Response(stream_chain(length), mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+BLOCK_FIELDS = ('index', 'timestamp', 'transactions', 'proof', 'previous_hash')
+
+@app.route('/blocks/receive', methods=['POST'])
+def receive_block():
+    data = request.get_json(silent=True) or {}
+    block = data.get('block')
+    if not isinstance(block, dict) or any(field not in block for field in BLOCK_FIELDS) \
+            or not isinstance(block['transactions'], list):
+        return jsonify({'message': 'Invalid block'}), 400
+    if blockchain.receive_block(block):
+        return jsonify({'message': 'Block appended', 'length': len(blockchain.chain)}), 201
+    # Блок алынды, бірақ ұшты жалғастырмайды: жеткізу сәтті, тізбек өзгермейді
+    return jsonify({'message': 'Block ignored', 'length': len(blockchain.chain)}), 200
 
 @app.route('/nodes/register', methods=['POST'])
 def register_nodes():
@@ -75,35 +500,205 @@ def register_nodes():
         blockchain.nodes.add(node)
     return jsonify({'message': 'Nodes added', 'total_nodes': list(blockchain.nodes)}), 201
 
+@app.route('/nodes/latency', methods=['GET'])
+def peer_latency():
+    return jsonify({'latency': peer_transport.latency_percentiles(), 'samples': len(peer_transport.latencies)}), 200
+
 # Блок құру 
 @socketio.on('broadcast_block')
 def broadcast_block(data):
-    for node in blockchain.nodes:
-        try:
-            requests.post(f'http://{node}/chain', json={'block': data})
-        except requests.exceptions.RequestException:
-            pass
+    with BROADCAST_SECONDS.time():
+        return peer_transport.broadcast(list(blockchain.nodes), '/blocks/receive', {'block': data})
 
 def start_server():
     socketio.run(app, host='0.0.0.0', port=5000)
 
-threading.Thread(target=start_server, daemon=True).start()
+# Асинхронды ASGI режимі: транзакциялар топпен қабылданып, шектелген кезекке түседі,
+# оларды жалғыз committer мемпулға жазады. Іске қосу: python Blockchain_4lab.py --asgi
+# (Flask сервері сол процестегі ағында іске қосылады, сондықтан блокчейн мен мемпул ортақ)
+INGEST_QUEUE_LIMIT = 100000  # Кезектегі транзакциялардың ең көп саны
+MAX_BATCH_SIZE = 10000
+class IngestQueue:
+    def __init__(self, limit=INGEST_QUEUE_LIMIT):
+        self.limit = limit
+        self.queue = None
+        self.queued = 0  # Кезекте күтіп тұрған транзакциялар саны
+        self.accepted = 0
+        self.rejected = 0
+        self.committer = None
+
+    def start(self):
+        if self.committer is None:
+            self.queue = asyncio.Queue()
+            self.committer = asyncio.get_running_loop().create_task(self.commit_loop())
+
+    def offer(self, batch):
+        """Орын болса топты кезекке қою; толы болса False (клиентке 429)"""
+        if self.queued + len(batch) > self.limit:
+            return False
+        self.queued += len(batch)
+        self.queue.put_nowait(batch)
+        return True
+
+    async def commit_loop(self):
+        while True:
+            batch = await self.queue.get()
+            # Мемпулға жазу блоктайтын код, сондықтан оқиғалар циклін тоқтатпау үшін ағында орындалады
+            try:
+                accepted = await asyncio.to_thread(self.commit, batch)
+            except Exception:
+                accepted = 0  # Күтпеген қате: топ қабылданбады, бірақ committer жұмысын жалғастырады
+            self.accepted += accepted
+            self.rejected += len(batch) - accepted
+            self.queued -= len(batch)
+
+    @staticmethod
+    def commit(batch):
+        accepted = 0
+        for tx in batch:
+            if blockchain.add_transaction(tx['sender'], tx['receiver'], tx['amount'], tx.get('fee', 0), tx.get('nonce')) is not None:
+                accepted += 1
+        return accepted
+
+ingest_queue = IngestQueue()
+
+async def _read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+async def _send_json(send, status, payload, headers=()):
+    body = json.dumps(payload).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode()), *headers],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def asgi_app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                ingest_queue.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+    ingest_queue.start()
+    path, method = scope['path'], scope['method']
+    if path == '/transactions/batch' and method == 'POST':
+        try:
+            batch = json.loads(await _read_body(receive))['transactions']
+            if not isinstance(batch, list) or any(transaction_error(tx) for tx in batch):
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            await _send_json(send, 400, {'message': 'Invalid transaction batch'})
+            return
+        if len(batch) > MAX_BATCH_SIZE:
+            await _send_json(send, 413, {'message': f'Batch larger than {MAX_BATCH_SIZE}'})
+            return
+        if not ingest_queue.offer(batch):
+            await _send_json(send, 429, {'message': 'Ingest queue full'}, [(b'retry-after', b'1')])
+            return
+        await _send_json(send, 202, {'message': f'{len(batch)} transactions queued', 'queued': ingest_queue.queued})
+    elif path == '/ingest/stats' and method == 'GET':
+        await _send_json(send, 200, {
+            'queued': ingest_queue.queued,
+            'accepted': ingest_queue.accepted,
+            'rejected': ingest_queue.rejected,
+            'mempool': len(blockchain.mempool),
+        })
+    else:
+        await _send_json(send, 404, {'message': 'Not found'})
+
+def load_test(url="http://127.0.0.1:5001", clients=8, requests_per_client=50, batch_size=1000):
+    """/transactions/batch-қа жүктеме беріп, TPS және p99 кідірісін есептеу.
+    202 тек кезекке қабылданғанын білдіреді, сондықтан TPS мемпулға жазылған
+    транзакциялар бойынша /ingest/stats-тан кезек босағанда есептеледі"""
+    latencies = []
+    throttled = [0]
+    lock = threading.Lock()
+
+    def client(client_id):
+        session = requests.Session()
+        for request_id in range(requests_per_client):
+            batch = [
+                {'sender': f'load{client_id}', 'receiver': 'sink', 'amount': 1, 'fee': i % 10, 'nonce': request_id * batch_size + i}
+                for i in range(batch_size)
+            ]
+            start = time.perf_counter()
+            response = session.post(f'{url}/transactions/batch', json={'transactions': batch})
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if response.status_code != 202:
+                    throttled[0] += 1
+
+    before = requests.get(f'{url}/ingest/stats').json()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Кезектегі топтар мемпулға жазылып біткенше күту
+    while True:
+        stats = requests.get(f'{url}/ingest/stats').json()
+        if stats['queued'] == 0:
+            break
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - start
+    committed = stats['accepted'] - before['accepted']
+    rejected = stats['rejected'] - before['rejected']
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{committed / elapsed:,.0f} TPS ({committed} committed, {rejected} rejected), "
+          f"p99 {p99 * 1000:.1f} ms, {throttled[0]} throttled requests")
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_validation()
+        sys.exit(0)
+    if "--load-test" in sys.argv:
+        load_test()
+        sys.exit(0)
+    if "--asgi" in sys.argv:
+        import uvicorn
+        # /mine, /chain және /metrics Flask серверінде қалады, екеуі бір blockchain объектісін қолданады
+        threading.Thread(target=start_server, daemon=True).start()
+        uvicorn.run(asgi_app, host='0.0.0.0', port=5001)
+        sys.exit(0)
+    threading.Thread(target=start_server, daemon=True).start()
+
+    # GUI
+    root = tk.Tk()
+    root.title("Blockchain GUI")
 
-# GUI
-root = tk.Tk()
-root.title("Blockchain GUI")
+    log = scrolledtext.ScrolledText(root, width=50, height=20)
+    log.pack()
 
-log = scrolledtext.ScrolledText(root, width=50, height=20)
-log.pack()
+    def mine():
+        response = requests.get("http://127.0.0.1:5000/mine").json()
+        log.insert(tk.END, f"{response['message']}: {response['block']}\n")
 
-def mine():
-    response = requests.get("http://127.0.0.1:5000/mine").json()
-    log.insert(tk.END, f"{response['message']}: {response['block']}\n")
+    chain_cache = {'etag': None, 'chain': None}
 
-def show_chain():
-    response = requests.get("http://127.0.0.1:5000/chain").json()
-    log.insert(tk.END, f"Blockchain: {response['chain']}\n")
+    def show_chain():
+        # Тізбек өзгермесе, сервер 304 қайтарады және сақталған көшірме көрсетіледі
+        headers = {'If-None-Match': chain_cache['etag']} if chain_cache['etag'] else {}
+        response = requests.get("http://127.0.0.1:5000/chain", headers=headers)
+        if response.status_code != 304:
+            chain_cache['etag'] = response.headers.get('ETag')
+            chain_cache['chain'] = response.json()['chain']
+        log.insert(tk.END, f"Blockchain: {chain_cache['chain']}\n")
 
-tk.Button(root, text="Mine Block", command=mine).pack()
-tk.Button(root, text="Show Chain", command=show_chain).pack()
-root.mainloop()
+    tk.Button(root, text="Mine Block", command=mine).pack()
+    tk.Button(root, text="Show Chain", command=show_chain).pack()
+    root.mainloop()
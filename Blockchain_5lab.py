@@ -1,10 +1,128 @@
 import hashlib
 import time
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QTextEdit, QLineEdit, QLabel
+import os
+import struct
+import tracemalloc
+import multiprocessing
+from array import array
+from types import SimpleNamespace
+from metrics import REGISTRY, start_http_server
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QThread, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QTextEdit, QLineEdit, QLabel, QListView
 import sys
+from collections import deque
+
+# Параллель майнинг: nonce кеңістігі процестер арасында қадаммен бөлінеді
+STOP_CHECK_INTERVAL = 1024  # Тоқтау сигналын қаншалықты жиі тексеру
+PROGRESS_INTERVAL = 50000  # progress(nonce, hash_rate) шақыру жиілігі (бір процесті майнинг)
+
+class MiningCancelled(Exception):
+    # progress кері шақыруы майнингті тоқтату үшін көтереді
+    pass
+
+# Бинарлы тақырып: index | previous_hash | транзакциялар хэші | timestamp | difficulty | miner хэші | nonce
+HEADER_FORMAT = "<I32s32sdI32s"
+
+def difficulty_target(difficulty):
+    """hexdigest().startswith('0' * difficulty) шартына тең бүтін сан шегі"""
+    return 1 << (256 - 4 * difficulty)
+
+def _to_digest(value):
+    # 64 символды hex хэш тікелей байтқа айналады, қалғандары SHA-256 арқылы 32 байтқа келтіріледі
+    if len(value) == 64:
+        try:
+            return bytes.fromhex(value)
+        except ValueError:
+            pass
+    return hashlib.sha256(value.encode()).digest()
+
+def _mine_worker(job, start, step, stop_event, results):
+    head, tail, prefix = job
+    nonce = start
+    hashes = 0
+    while True:
+        block_hash = hashlib.sha256(f"{head}{nonce}{tail}".encode()).hexdigest()
+        hashes += 1
+        if block_hash.startswith(prefix):
+            stop_event.set()
+            results.put((nonce, block_hash, hashes))
+            return
+        if hashes % STOP_CHECK_INTERVAL == 0 and stop_event.is_set():
+            results.put((None, None, hashes))
+            return
+        nonce += step
+
+def _mine_header_worker(job, start, step, stop_event, results):
+    # Тақырыптың тұрақты бөлігінің midstate-і бір рет есептеледі, әр әрекетте тек 8 байт nonce қосылады
+    header_prefix, target = job
+    midstate = hashlib.sha256(header_prefix)
+    nonce = start
+    hashes = 0
+    while True:
+        h = midstate.copy()
+        h.update(nonce.to_bytes(8, "little"))
+        digest = h.digest()
+        hashes += 1
+        if int.from_bytes(digest, "big") < target:
+            stop_event.set()
+            results.put((nonce, digest.hex(), hashes))
+            return
+        if hashes % STOP_CHECK_INTERVAL == 0 and stop_event.is_set():
+            results.put((None, None, hashes))
+            return
+        nonce += step
+
+def parallel_mine(worker, job, workers=None):
+    """Nonce іздеуді бірнеше ядроға таратады: (nonce, hash, hashes, elapsed) қайтарады"""
+    workers = workers or os.cpu_count() or 1
+    stop_event = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=worker,
+            args=(job, i + 1, workers, stop_event, results),
+            daemon=True,
+        )
+        for i in range(workers)
+    ]
+    start_time = time.perf_counter()
+    for process in processes:
+        process.start()
+    found = None
+    total_hashes = 0
+    for _ in processes:
+        nonce, block_hash, hashes = results.get()
+        total_hashes += hashes
+        if nonce is not None and found is None:
+            found = (nonce, block_hash)
+    elapsed = time.perf_counter() - start_time
+    for process in processes:
+        process.join()
+    return found[0], found[1], total_hashes, elapsed
+
+# Майнинг телеметриясы
+MINING_SECONDS = REGISTRY.histogram('miner_block_seconds', 'Time spent in Block.mine_block')
+MINED_BLOCKS = REGISTRY.counter('miner_blocks_total', 'Blocks mined by Block.mine_block')
+HASH_RATE = REGISTRY.gauge('miner_hash_rate', 'Hashes per second of the last mined block')
+METRICS_PORT = int(os.environ.get("METRICS_PORT", 9105))  # GUI процесінің /metrics порты
+
+def _pack_hash(value):
+    # 64 символды hex хэш 32 байт ретінде сақталады, басқа мәндер ("0" сияқты) өзгеріссіз қалады
+    if isinstance(value, str) and len(value) == 64:
+        try:
+            return bytes.fromhex(value)
+        except ValueError:
+            pass
+    return value
+
+def _unpack_hash(value):
+    return value.hex() if isinstance(value, bytes) else value
 
 class Block:
-    def __init__(self, index, previous_hash, transactions, difficulty, miner):
+    __slots__ = ("index", "_previous_hash", "transactions", "timestamp", "difficulty", "nonce",
+                 "miner", "workers", "header_mining", "hash_rate", "_hash")
+
+    def __init__(self, index, previous_hash, transactions, difficulty, miner, workers=1, header_mining=False, progress=None):
         self.index = index
         self.previous_hash = previous_hash
         self.transactions = transactions
@@ -12,65 +130,341 @@ class Block:
         self.difficulty = difficulty
         self.nonce = 0
         self.miner = miner
-        self.hash = self.mine_block()
+        self.workers = workers  # Майнинг процестерінің саны
+        self.header_mining = header_mining  # Бинарлы тақырып пен midstate арқылы майнинг
+        self.hash_rate = 0.0  # Секундына хэш саны
+        with MINING_SECONDS.time():
+            self.hash = self.mine_block(progress)
+        MINED_BLOCKS.inc()
+        HASH_RATE.set(self.hash_rate)
+
+    @property
+    def hash(self):
+        return _unpack_hash(self._hash)
+
+    @hash.setter
+    def hash(self, value):
+        self._hash = _pack_hash(value)
+
+    @property
+    def previous_hash(self):
+        return _unpack_hash(self._previous_hash)
+
+    @previous_hash.setter
+    def previous_hash(self, value):
+        self._previous_hash = _pack_hash(value)
     
     def calculate_hash(self):
+        if self.header_mining:
+            return hashlib.sha256(self.header_prefix() + self.nonce.to_bytes(8, "little")).hexdigest()
         block_data = f"{self.index}{self.previous_hash}{self.transactions}{self.timestamp}{self.nonce}{self.difficulty}{self.miner}"
         return hashlib.sha256(block_data.encode()).hexdigest()
+
+    def header_prefix(self):
+        """Nonce-сыз тұрақты өлшемді тақырып (транзакцияларға бір рет міндеттеме)"""
+        return struct.pack(
+            HEADER_FORMAT,
+            self.index,
+            _to_digest(self.previous_hash),
+            hashlib.sha256(str(self.transactions).encode()).digest(),
+            self.timestamp,
+            self.difficulty,
+            _to_digest(self.miner),
+        )
     
-    def mine_block(self):
+    def mine_block(self, progress=None):
+        if self.workers > 1:
+            return self.mine_block_parallel()
+        if self.header_mining:
+            return self.mine_block_header(progress)
         prefix = '0' * self.difficulty
+        start_time = time.perf_counter()
         while True:
             self.nonce += 1
             block_hash = self.calculate_hash()
             if block_hash.startswith(prefix):
+                self.hash_rate = self.nonce / max(time.perf_counter() - start_time, 1e-9)
                 return block_hash
+            if progress is not None and self.nonce % PROGRESS_INTERVAL == 0:
+                progress(self.nonce, self.nonce / max(time.perf_counter() - start_time, 1e-9))
+
+    def mine_block_header(self, progress=None):
+        # Әр nonce әрекетінің құны транзакциялар санына тәуелді емес
+        midstate = hashlib.sha256(self.header_prefix())
+        target = difficulty_target(self.difficulty)
+        start_time = time.perf_counter()
+        while True:
+            self.nonce += 1
+            h = midstate.copy()
+            h.update(self.nonce.to_bytes(8, "little"))
+            digest = h.digest()
+            if int.from_bytes(digest, "big") < target:
+                self.hash_rate = self.nonce / max(time.perf_counter() - start_time, 1e-9)
+                return digest.hex()
+            if progress is not None and self.nonce % PROGRESS_INTERVAL == 0:
+                progress(self.nonce, self.nonce / max(time.perf_counter() - start_time, 1e-9))
+
+    def mine_block_parallel(self):
+        if self.header_mining:
+            worker = _mine_header_worker
+            job = (self.header_prefix(), difficulty_target(self.difficulty))
+        else:
+            # nonce хэш жолының ортасында тұр, сондықтан алдыңғы және соңғы бөліктерін бір рет құрамыз
+            worker = _mine_worker
+            job = (
+                f"{self.index}{self.previous_hash}{self.transactions}{self.timestamp}",
+                f"{self.difficulty}{self.miner}",
+                '0' * self.difficulty,
+            )
+        self.nonce, block_hash, hashes, elapsed = parallel_mine(worker, job, self.workers)
+        self.hash_rate = hashes / max(elapsed, 1e-9)
+        return block_hash
+
+# Бағандық тізбек: тұрақты өрістер array-ларда, хэштер 32 байттық bytearray-де
+class PackedChain:
+    def __init__(self):
+        self.indexes = array("Q")
+        self.timestamps = array("d")
+        self.nonces = array("Q")
+        self.difficulties = array("B")
+        self.header_flags = array("B")
+        self.hashes = bytearray()
+        self.previous_hashes = bytearray()
+        self.raw_previous_hashes = {}  # 32 байтқа сыймайтын previous_hash мәндері (генезистегі "0")
+        self.miner_ids = array("I")
+        self.miner_names = []
+        self.miner_lookup = {}
+        self.transactions = []
+
+    def append(self, block):
+        position = len(self.indexes)
+        self.indexes.append(block.index)
+        self.timestamps.append(block.timestamp)
+        self.nonces.append(block.nonce)
+        self.difficulties.append(block.difficulty)
+        self.header_flags.append(block.header_mining)
+        self.hashes += _pack_hash(block.hash)
+        previous_hash = _pack_hash(block.previous_hash)
+        if isinstance(previous_hash, bytes):
+            self.previous_hashes += previous_hash
+        else:
+            self.previous_hashes += bytes(32)
+            self.raw_previous_hashes[position] = previous_hash
+        miner_id = self.miner_lookup.get(block.miner)
+        if miner_id is None:
+            miner_id = self.miner_lookup[block.miner] = len(self.miner_names)
+            self.miner_names.append(block.miner)
+        self.miner_ids.append(miner_id)
+        self.transactions.append(block.transactions)
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("block position out of range")
+        return PackedBlock(self, position)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield PackedBlock(self, position)
+
+class PackedBlock:
+    """PackedChain ішіндегі блокқа Block-пен бірдей атрибуттар арқылы қол жеткізу"""
+    __slots__ = ("chain", "position")
+
+    def __init__(self, chain, position):
+        self.chain = chain
+        self.position = position
+
+    index = property(lambda self: self.chain.indexes[self.position])
+    timestamp = property(lambda self: self.chain.timestamps[self.position])
+    nonce = property(lambda self: self.chain.nonces[self.position])
+    difficulty = property(lambda self: self.chain.difficulties[self.position])
+    header_mining = property(lambda self: bool(self.chain.header_flags[self.position]))
+    miner = property(lambda self: self.chain.miner_names[self.chain.miner_ids[self.position]])
+    transactions = property(lambda self: self.chain.transactions[self.position])
+
+    @property
+    def hash(self):
+        return self.chain.hashes[self.position * 32:(self.position + 1) * 32].hex()
+
+    @property
+    def previous_hash(self):
+        raw = self.chain.raw_previous_hashes.get(self.position)
+        if raw is not None:
+            return raw
+        return self.chain.previous_hashes[self.position * 32:(self.position + 1) * 32].hex()
+
+    calculate_hash = Block.calculate_hash
+    header_prefix = Block.header_prefix
+
+def _measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+def benchmark_memory(count=100000):
+    """Бір блокқа шаққандағы жад: __dict__ объектілері, __slots__ блоктары және PackedChain"""
+    transactions = [[] for _ in range(count)]
+    blocks, slotted = _measure(lambda: [Block(i, "0" * 64, transactions[i], 0, "bench") for i in range(count)])
+    fields = ("index", "previous_hash", "transactions", "timestamp", "difficulty", "nonce", "miner", "workers", "header_mining", "hash_rate", "hash")
+    _, dict_based = _measure(lambda: [SimpleNamespace(**{name: getattr(block, name) for name in fields}) for block in blocks])
+    packed = PackedChain()
+    _, columnar = _measure(lambda: [packed.append(block) for block in blocks] and None)
+    print(f"__dict__ objects: {dict_based / count:.0f} B/block")
+    print(f"__slots__ Block: {slotted / count:.0f} B/block")
+    print(f"PackedChain: {columnar / count:.0f} B/block")
+
+def benchmark_mining(difficulty=5, worker_counts=None, tx_counts=(0, 1000)):
+    """Әр процесс саны мен транзакция санына арналған хэш жылдамдығын көрсету"""
+    worker_counts = worker_counts or sorted({1, 2, os.cpu_count() or 1})
+    for header_mining in (False, True):
+        for tx_count in tx_counts:
+            transactions = [{"from": "a", "to": "b", "amount": i} for i in range(tx_count)]
+            for workers in worker_counts:
+                block = Block(1, "0" * 64, transactions, difficulty, "bench", workers=workers, header_mining=header_mining)
+                print(f"header={header_mining} txs={tx_count} workers={workers} nonce={block.nonce} hash_rate={block.hash_rate:,.0f} H/s")
+
+def block_work(difficulty):
+    # Қажетті хэштердің күтілетін саны: hex префиксіндегі әр нөл 16 есе көп жұмыс
+    return 16 ** difficulty
 
 # Блокчейн классы
 class Blockchain:
-    def __init__(self, difficulty=4, reward=50, fee=5):
+    def __init__(self, difficulty=4, reward=50, fee=5, workers=1, header_mining=False):
         self.difficulty = difficulty  # Ең алдымен difficulty орнату керек!
         self.reward = reward
         self.fee = fee
+        self.workers = workers
+        self.header_mining = header_mining
         self.pending_transactions = []
-        self.miners = {}
-        self.chain = [self.create_genesis_block()]  # Енді difficulty анықталған!
+        self.miners = {}  # майнер -> табылған блоктар саны
+        # Блок ағашы: хэш -> блок және хэш -> жиынтық жұмыс; self.chain - ең ауыр тармақ
+        genesis = self.create_genesis_block()  # Енді difficulty анықталған!
+        self.blocks = {genesis.hash: genesis}
+        self.cumulative_work = {genesis.hash: block_work(genesis.difficulty)}
+        self.chain = [genesis]
 
     def create_genesis_block(self):
-        return Block(0, "0", "Genesis Block", self.difficulty, "Genesis")
+        return Block(0, "0", "Genesis Block", self.difficulty, "Genesis", header_mining=self.header_mining)
     
     def add_transaction(self, transaction):
         self.pending_transactions.append(transaction)
     
     def mine_pending_transactions(self, miner_address):
+        self.accept_block(Block(*self.block_template(miner_address)))
+    
+    def block_template(self, miner_address):
+        """Кезектегі транзакцияларды алып, майнингке арналған Block аргументтерін қайтару"""
         # Жүлде мен комиссия механизмі
         total_fees = len(self.pending_transactions) * self.fee
         reward_transaction = {"from": "network", "to": miner_address, "amount": self.reward + total_fees}
-        self.pending_transactions.append(reward_transaction)
-        
-        new_block = Block(len(self.chain), self.chain[-1].hash, self.pending_transactions, self.difficulty, miner_address)
-        
-        if miner_address in self.miners:
-            self.miners[miner_address].append(new_block)
-        else:
-            self.miners[miner_address] = [new_block]
-        
-        self.resolve_conflict()
-    
-    def resolve_conflict(self):
-        # Миннинг сценарийлері: longest chain ережесі
-        longest_chain = sorted(self.miners.values(), key=len, reverse=True)[0]
-        self.chain = longest_chain
+        transactions = self.pending_transactions + [reward_transaction]
         self.pending_transactions = []
+        return (len(self.chain), self.chain[-1].hash, transactions, self.difficulty, miner_address, self.workers, self.header_mining)
+    
+    def accept_block(self, block):
+        self.miners[block.miner] = self.miners.get(block.miner, 0) + 1
+        return self.add_block(block)
+    
+    def restore_transactions(self, transactions):
+        # Тоқтатылған тапсырманың транзакциялары (жүлдесіз) кезектің басына қайтарылады
+        self.pending_transactions[:0] = transactions[:-1]
+    
+    def add_block(self, block):
+        """Блокты ағашқа қосу; ол ең ауыр тармақтың ұшы болса, тізбек қайта құрылады"""
+        parent = self.blocks.get(block.previous_hash)
+        if parent is None or block.hash in self.blocks or block.index != parent.index + 1:
+            return False
+        work = self.cumulative_work[parent.hash] + block_work(block.difficulty)
+        self.blocks[block.hash] = block
+        self.cumulative_work[block.hash] = work
+        # Миннинг сценарийлері: ең көп жұмыс жасалған тізбек ережесі, ұшты таңдау O(1)
+        if work > self.cumulative_work[self.chain[-1].hash]:
+            self.resolve_conflict(block)
+            return True
+        return False
+    
+    def resolve_conflict(self, new_tip):
+        # Жаңа ұштан ортақ атаға дейін жүріп, тек өзгерген бөлік ауыстырылады (reorg)
+        branch = []
+        block = new_tip
+        while block.index >= len(self.chain) or self.chain[block.index] is not block:
+            branch.append(block)
+            block = self.blocks[block.previous_hash]
+        del self.chain[block.index + 1:]
+        self.chain.extend(reversed(branch))
     
     def print_chain(self):
         for block in self.chain:
             print(f"Index: {block.index}, Hash: {block.hash}, Previous: {block.previous_hash}, Nonce: {block.nonce}, Miner: {block.miner}")
 
+# Тізбек моделі: көрсетілген блоктарға сілтемелер сақталады, reorg кезінде тек айырылу нүктесінен кейінгі жолдар ауысады
+class ChainModel(QAbstractListModel):
+    def __init__(self, blockchain):
+        super().__init__()
+        self.blockchain = blockchain
+        self.known = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.known)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        block = self.known[index.row()]
+        return f"Блок {block.index} | Хеш: {block.hash[:10]}... | Предыдущий: {block.previous_hash[:10]}... | Майнер: {block.miner}"
+    
+    def sync(self):
+        chain = self.blockchain.chain
+        # Ұштан бастап ортақ блокты іздеу: әдетте тек соңғы бірнеше блок өзгереді
+        fork = min(len(chain), len(self.known))
+        while fork > 0 and self.known[fork - 1] is not chain[fork - 1]:
+            fork -= 1
+        if fork < len(self.known):
+            self.beginRemoveRows(QModelIndex(), fork, len(self.known) - 1)
+            del self.known[fork:]
+            self.endRemoveRows()
+        if fork < len(chain):
+            self.beginInsertRows(QModelIndex(), fork, len(chain) - 1)
+            self.known.extend(chain[fork:])
+            self.endInsertRows()
+
+# Фондық майнинг: nonce іздеу QThread-те жүреді, блок GUI ағынында тізбекке қосылады
+class MiningThread(QThread):
+    progress = pyqtSignal(int, float)
+    mined = pyqtSignal(object)
+    cancelled = pyqtSignal(object)
+    
+    def __init__(self, template):
+        super().__init__()
+        self.template = template
+    
+    def report(self, nonce, hash_rate):
+        if self.isInterruptionRequested():
+            raise MiningCancelled
+        self.progress.emit(nonce, hash_rate)
+    
+    def run(self):
+        try:
+            block = Block(*self.template, progress=self.report)
+        except MiningCancelled:
+            self.cancelled.emit(self.template[2])
+            return
+        self.mined.emit(block)
+
 class BlockchainGUI(QWidget):
     def __init__(self):
         super().__init__()
         self.blockchain = Blockchain()
+        self.mining_queue = deque()  # Кезектегі майнинг тапсырмалары (майнер аттары)
+        self.mining_thread = None
         self.initUI()
     
     def initUI(self):
@@ -79,6 +473,13 @@ class BlockchainGUI(QWidget):
         
         layout = QVBoxLayout()
         
+        layout.addWidget(QLabel("Актуальная цепочка блоков:"))
+        self.model = ChainModel(self.blockchain)
+        self.chain_view = QListView()
+        self.chain_view.setUniformItemSizes(True)
+        self.chain_view.setModel(self.model)
+        layout.addWidget(self.chain_view)
+        
         self.log = QTextEdit()
         self.log.setReadOnly(True)
         layout.addWidget(self.log)
@@ -99,6 +500,13 @@ class BlockchainGUI(QWidget):
         self.mine_button.clicked.connect(self.mine_block)
         layout.addWidget(self.mine_button)
         
+        self.cancel_button = QPushButton("Отменить майнинг")
+        self.cancel_button.clicked.connect(self.cancel_mining)
+        layout.addWidget(self.cancel_button)
+        
+        self.status = QLabel("Майнинг не запущен")
+        layout.addWidget(self.status)
+        
         self.setLayout(layout)
         self.update_log()
     
@@ -118,19 +526,69 @@ class BlockchainGUI(QWidget):
     def mine_block(self):
         miner = self.miner_input.text().strip()
         if miner:
-            self.blockchain.mine_pending_transactions(miner)
-            self.log.append(f"Блок замайнен майнером {miner}")
-            self.update_log()
+            self.mining_queue.append(miner)
+            self.log.append(f"Задание на майнинг добавлено в очередь: {miner}")
+            self.start_next_job()
         else:
             self.log.append("Ошибка: введите имя майнера!")
     
+    def start_next_job(self):
+        if self.mining_thread is not None or not self.mining_queue:
+            return
+        # Шаблон GUI ағынында алынады: келесі тапсырма алдыңғы блоктың үстіне құрылады
+        miner = self.mining_queue.popleft()
+        self.mining_thread = MiningThread(self.blockchain.block_template(miner))
+        self.mining_thread.progress.connect(self.on_progress)
+        self.mining_thread.mined.connect(self.on_mined)
+        self.mining_thread.cancelled.connect(self.on_cancelled)
+        self.mining_thread.finished.connect(self.on_finished)
+        self.status.setText(f"Майнинг: {miner}, в очереди: {len(self.mining_queue)}")
+        self.mining_thread.start()
+    
+    def on_progress(self, nonce, hash_rate):
+        self.status.setText(f"Майнинг: nonce {nonce}, {hash_rate:,.0f} H/s, в очереди: {len(self.mining_queue)}")
+    
+    def on_mined(self, block):
+        self.blockchain.accept_block(block)
+        self.log.append(f"Блок замайнен майнером {block.miner} ({block.hash_rate:,.0f} H/s)")
+        self.update_log()
+    
+    def on_cancelled(self, transactions):
+        self.blockchain.restore_transactions(transactions)
+        self.log.append("Майнинг отменён")
+    
+    def on_finished(self):
+        self.mining_thread.wait()
+        self.mining_thread = None
+        self.status.setText("Майнинг не запущен")
+        self.start_next_job()
+    
+    def cancel_mining(self):
+        self.mining_queue.clear()
+        if self.mining_thread is not None:
+            self.mining_thread.requestInterruption()
+    
+    def closeEvent(self, event):
+        self.cancel_mining()
+        if self.mining_thread is not None:
+            self.mining_thread.wait()
+        super().closeEvent(event)
+    
     def update_log(self):
-        self.log.append("\nАктуальная цепочка блоков:")
-        for block in self.blockchain.chain:
-            self.log.append(f"Блок {block.index} | Хеш: {block.hash[:10]}... | Предыдущий: {block.previous_hash[:10]}... | Майнер: {block.miner}")
-        self.log.append("--------------------------------")
+        self.model.sync()
+        self.chain_view.scrollToBottom()
 
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_mining()
+        sys.exit(0)
+    if "--bench-memory" in sys.argv:
+        benchmark_memory()
+        sys.exit(0)
+    try:
+        start_http_server(METRICS_PORT)
+    except OSError as error:
+        print(f"Metrics exporter disabled: {error}")
     app = QApplication(sys.argv)
     gui = BlockchainGUI()
     gui.show()
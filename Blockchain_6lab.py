@@ -1,85 +1,364 @@
+import os
+import sys
 import time
+import struct
 import hashlib
+import heapq
 import random
+import queue
+import threading
+import tracemalloc
+from collections import deque
+from types import SimpleNamespace
+from bisect import bisect_right
+from itertools import accumulate
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 import tkinter as tk
-from tkinter import messagebox, scrolledtext
-from ecdsa import SigningKey, VerifyingKey, SECP256k1
+from tkinter import messagebox
+from metrics import REGISTRY, start_http_server
+from ecdsa import SigningKey, VerifyingKey, SECP256k1, BadSignatureError, MalformedPointError
 
 # Хэш функция (SHA-256)
 def sha256_hash(data):
     return hashlib.sha256(data.encode()).hexdigest()
 
+# Бинарлы тақырып: timestamp | previous_hash | транзакциялар хэші | nonce
+HEADER_FORMAT = "<d32s32s"
+
+def difficulty_target(difficulty):
+    # hash[:difficulty] == "0" * difficulty шартына тең бүтін сан шегі
+    return 1 << (256 - 4 * difficulty)
+
+PROGRESS_INTERVAL = 50000  # progress(nonce, hash_rate) шақыру жиілігі
+
+class MiningCancelled(Exception):
+    # progress кері шақыруы майнингті тоқтату үшін көтереді
+    pass
+
+def _to_digest(value):
+    if len(value) == 64:
+        try:
+            return bytes.fromhex(value)
+        except ValueError:
+            pass
+    return hashlib.sha256(value.encode()).digest()
+
 # Транзакция
 class Transaction:
+    __slots__ = ("sender", "receiver", "amount", "fee", "timestamp", "tx_digest", "signature")
+
     def __init__(self, sender, receiver, amount, fee, signature=""):
         self.sender = sender
         self.receiver = receiver
         self.amount = amount
         self.fee = fee
         self.timestamp = time.time()
-        self.tx_id = sha256_hash(f"{self.sender}{self.receiver}{self.amount}{self.fee}{self.timestamp}")
+        # tx_id 32 байттық дайджест ретінде сақталады, hex түрі сұралғанда жасалады
+        self.tx_digest = hashlib.sha256(f"{self.sender}{self.receiver}{self.amount}{self.fee}{self.timestamp}".encode()).digest()
         self.signature = signature
+
+    @property
+    def tx_id(self):
+        return self.tx_digest.hex()
     
     def sign_transaction(self, private_key):
         message = sha256_hash(f"{self.sender}{self.receiver}{self.amount}{self.fee}{self.timestamp}")
         self.signature = private_key.sign(message.encode()).hex()
 
+    def signed_fields(self):
+        # Процестер арасында жіберуге ыңғайлы, қолтаңбаны тексеруге қажет өрістер
+        return (self.sender, self.receiver, self.amount, self.fee, self.timestamp, self.signature)
+
+# Қолтаңбаны тексеру: декодталған VerifyingKey объектілері LRU кэште сақталады
+KEY_CACHE_SIZE = 4096
+SYSTEM_SENDER = "System"  # Марапат транзакциялары қолтаңбасыз
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def load_verifying_key(sender):
+    return VerifyingKey.from_string(bytes.fromhex(sender), curve=SECP256k1)
+
+def verify_fields(fields):
+    sender, receiver, amount, fee, timestamp, signature = fields
+    if sender == SYSTEM_SENDER:
+        return True
+    message = sha256_hash(f"{sender}{receiver}{amount}{fee}{timestamp}")
+    try:
+        return load_verifying_key(sender).verify(bytes.fromhex(signature), message.encode())
+    except (ValueError, BadSignatureError, MalformedPointError):
+        return False
+
+def _verify_chunk(chunk):
+    return [verify_fields(fields) for fields in chunk]
+
+class TransactionVerifier:
+    """Транзакцияларды топтап, процестер пулында тексереді"""
+
+    def __init__(self, workers=None, chunk_size=128):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.executor = None
+
+    def verify(self, transactions):
+        fields = [tx.signed_fields() for tx in transactions]
+        if self.workers == 1 or len(fields) <= self.chunk_size:
+            return _verify_chunk(fields)
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        chunks = [fields[i:i + self.chunk_size] for i in range(0, len(fields), self.chunk_size)]
+        results = []
+        for chunk_result in self.executor.map(_verify_chunk, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
 # Блок
 class Block:
-    def __init__(self, previous_hash, transactions, nonce=0):
+    def __init__(self, previous_hash, transactions, nonce=0, header_mining=False):
         self.timestamp = time.time()
         self.previous_hash = previous_hash
         self.transactions = transactions
         self.nonce = nonce
+        self.header_mining = header_mining  # Бинарлы тақырып пен midstate арқылы хэштеу
         self.hash = self.compute_hash()
     
     def compute_hash(self):
+        if self.header_mining:
+            return hashlib.sha256(self.header_prefix() + self.nonce.to_bytes(8, "little")).hexdigest()
         block_data = f"{self.timestamp}{self.previous_hash}{self.nonce}"
         for tx in self.transactions:
             block_data += tx.tx_id
         return sha256_hash(block_data)
 
+    def header_prefix(self):
+        # Транзакцияларға бір рет міндеттеме, nonce-сыз тұрақты өлшемді тақырып
+        tx_digest = hashlib.sha256("".join(tx.tx_id for tx in self.transactions).encode()).digest()
+        return struct.pack(HEADER_FORMAT, self.timestamp, _to_digest(self.previous_hash), tx_digest)
+
+# Стейк индексі: Fenwick ағашы, адрестер қосылу ретімен слот алады (stake_pool ретімен бірдей)
+class StakeIndex:
+    def __init__(self):
+        self.addresses = []
+        self.slots = {}  # адрес -> слот
+        self.stakes = []
+        self.tree = [0]  # 1-ден басталатын Fenwick массиві
+        self.total = 0
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def _update(self, slot, delta):
+        i = slot + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _append(self, address):
+        slot = len(self.addresses)
+        self.slots[address] = slot
+        self.addresses.append(address)
+        self.stakes.append(0)
+        # Жаңа Fenwick түйіні өзі қамтитын алдыңғы слоттардың қосындысымен басталады
+        i = slot + 1
+        value = 0
+        j = i - 1
+        while j > i - (i & -i):
+            value += self.tree[j]
+            j -= j & -j
+        self.tree.append(value)
+        return slot
+
+    def stake(self, address, amount):
+        """O(log n) стейк қосу"""
+        slot = self.slots.get(address)
+        if slot is None:
+            slot = self._append(address)
+        self.stakes[slot] += amount
+        self.total += amount
+        self._update(slot, amount)
+
+    def unstake(self, address, amount):
+        """O(log n) стейк азайту; адрестің слоты (және реті) сақталады"""
+        slot = self.slots[address]
+        amount = min(amount, self.stakes[slot])
+        self.stakes[slot] -= amount
+        self.total -= amount
+        self._update(slot, -amount)
+        return amount
+
+    def find(self, pick):
+        """Жиынтық стейгі pick-тен бірінші рет асатын адрес (сызықтық іздеумен бірдей), O(log n)"""
+        pos = 0
+        remaining = pick
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(self.tree) and self.tree[nxt] <= remaining:
+                pos = nxt
+                remaining -= self.tree[nxt]
+            step >>= 1
+        return self.addresses[pos] if pos < len(self.addresses) else None
+
+    def sample(self, rng=random):
+        if self.total <= 0:
+            return None
+        return self.find(rng.uniform(0, self.total))
+
+    def sample_many(self, count, rng=random):
+        """Симуляция үшін бірден көп валидатор таңдау: O(n + count log n)"""
+        if self.total <= 0:
+            return [None] * count
+        prefix = list(accumulate(self.stakes))
+        picks = (rng.uniform(0, self.total) for _ in range(count))
+        return [self.addresses[i] if i < len(prefix) else None for i in (bisect_right(prefix, pick) for pick in picks)]
+
+def _select_staker_linear(stake_pool, pick):
+    # Бұрынғы сызықтық алгоритм, таралуды салыстыру үшін
+    current = 0
+    for address, stake in stake_pool.items():
+        current += stake
+        if current > pick:
+            return address
+    return None
+
+def _chi_square_critical(df, z=3.0902):
+    # Уилсон-Хилферти жуықтауы; z = 3.0902 p = 0.001 деңгейіне сәйкес (df=49 үшін ~85.4)
+    return df * (1 - 2 / (9 * df) + z * (2 / (9 * df)) ** 0.5) ** 3
+
+def check_stake_distribution(samples=200000, stakers=50, seed=1):
+    """Fenwick таңдауы мен sample_many-ді сызықтық алгоритммен салыстыру: бірдей кездейсоқ сандарда бірдей нәтиже және хи-квадрат"""
+    rng = random.Random(seed)
+    index = StakeIndex()
+    stake_pool = {}
+    for i in range(stakers):
+        amount = rng.randint(1, 1000)
+        index.stake(f"addr{i}", amount)
+        stake_pool[f"addr{i}"] = amount
+    mismatches = 0
+    counts = {address: 0 for address in stake_pool}
+    for _ in range(samples):
+        pick = rng.uniform(0, index.total)
+        address = index.find(pick)
+        mismatches += address != _select_staker_linear(stake_pool, pick)
+        counts[address] += 1
+    # sample_many сол кездейсоқ сандар тізбегін алады: екі генератор бірдей күйден басталады
+    state = rng.getstate()
+    bulk = index.sample_many(samples, rng)
+    rng.setstate(state)
+    bulk_mismatches = sum(address != _select_staker_linear(stake_pool, rng.uniform(0, index.total)) for address in bulk)
+    chi_square = sum((counts[a] - samples * s / index.total) ** 2 / (samples * s / index.total) for a, s in stake_pool.items())
+    critical = _chi_square_critical(stakers - 1)
+    print(f"mismatches={mismatches}, bulk_mismatches={bulk_mismatches}, chi_square={chi_square:.1f} (df={stakers - 1}, critical={critical:.1f})")
+    return mismatches == 0 and bulk_mismatches == 0 and chi_square < critical
+
+# Майнинг телеметриясы
+MINING_SECONDS = REGISTRY.histogram('node_mine_block_seconds', 'Time spent in Node.mine_block')
+MINED_BLOCKS = REGISTRY.counter('node_mined_blocks_total', 'Blocks mined by Node.mine_block')
+METRICS_PORT = int(os.environ.get("METRICS_PORT", 9106))  # GUI процесінің /metrics порты
+
 # Узел блокчейна
 class Node:
-    def __init__(self, node_id):
+    def __init__(self, node_id, verifier=None):
         self.node_id = node_id
+        self.verifier = verifier or TransactionVerifier(workers=1)
         self.chain = [self.create_genesis_block()]
         self.pending_transactions = []
         self.difficulty = 4
         self.mining_reward = 10
         self.stake_pool = {}  # Стейкинг қоры
+        self.stake_index = StakeIndex()  # stake_pool-дың O(log n) таңдауға арналған көшірмесі
+        self.header_mining = False  # True болса, nonce әрекетінің құны транзакция санына тәуелді емес
     
     def create_genesis_block(self):
         return Block("0", [])
     
     def mine_block(self, miner_address):
-        block = Block(self.chain[-1].hash, self.pending_transactions)
+        with MINING_SECONDS.time():
+            block = self.solve_block(self.chain[-1].hash, self.pending_transactions)
+        self.commit_block(block, miner_address)
+    
+    def solve_block(self, previous_hash, transactions, progress=None):
+        """Тізбекті өзгертпей nonce іздеу (фондық ағыннан шақыруға болады)"""
+        if self.header_mining:
+            return self.mine_header_block(previous_hash, transactions, progress)
+        block = Block(previous_hash, transactions)
+        start_time = time.perf_counter()
         while block.hash[:self.difficulty] != "0" * self.difficulty:
             block.nonce += 1
             block.hash = block.compute_hash()
+            if progress is not None and block.nonce % PROGRESS_INTERVAL == 0:
+                progress(block.nonce, block.nonce / max(time.perf_counter() - start_time, 1e-9))
+        return block
+    
+    def commit_block(self, block, miner_address):
+        """Табылған блокты қосу; ұш өзгерген болса, блок ескірген деп қабылданбайды"""
+        if block.previous_hash != self.chain[-1].hash:
+            return False
+        MINED_BLOCKS.inc()
         self.chain.append(block)
-        self.pending_transactions = [Transaction("System", miner_address, self.mining_reward, 0)]
+        # Майнинг кезінде келген транзакциялар келесі блокқа қалады
+        remaining = self.pending_transactions[len(block.transactions):]
+        self.pending_transactions = [Transaction("System", miner_address, self.mining_reward, 0)] + remaining
+        return True
+    
+    def mine_header_block(self, previous_hash=None, transactions=None, progress=None):
+        if previous_hash is None:
+            previous_hash = self.chain[-1].hash
+        if transactions is None:
+            transactions = self.pending_transactions
+        block = Block(previous_hash, transactions, header_mining=True)
+        midstate = hashlib.sha256(block.header_prefix())
+        target = difficulty_target(self.difficulty)
+        start_time = time.perf_counter()
+        while True:
+            h = midstate.copy()
+            h.update(block.nonce.to_bytes(8, "little"))
+            digest = h.digest()
+            if int.from_bytes(digest, "big") < target:
+                block.hash = digest.hex()
+                return block
+            block.nonce += 1
+            if progress is not None and block.nonce % PROGRESS_INTERVAL == 0:
+                progress(block.nonce, block.nonce / max(time.perf_counter() - start_time, 1e-9))
     
     def add_transaction(self, transaction):
+        # Қолтаңбасы жарамсыз транзакция pending_transactions-қа түспейді
+        if not verify_fields(transaction.signed_fields()):
+            return False
         self.pending_transactions.append(transaction)
+        return True
+
+    def add_transactions(self, transactions):
+        """Транзакциялар тобын пул арқылы тексеріп, тек жарамдыларын қабылдау"""
+        results = self.verifier.verify(transactions)
+        for tx, valid in zip(transactions, results):
+            if valid:
+                self.pending_transactions.append(tx)
+        return results
     
     def stake(self, address, amount):
         if address in self.stake_pool:
             self.stake_pool[address] += amount
         else:
             self.stake_pool[address] = amount
+        self.stake_index.stake(address, amount)
+    
+    def unstake(self, address, amount):
+        if address not in self.stake_pool:
+            return 0
+        amount = self.stake_index.unstake(address, amount)
+        self.stake_pool[address] -= amount
+        return amount
     
     def select_staker(self):
-        total_stake = sum(self.stake_pool.values())
-        if total_stake == 0:
-            return None
-        pick = random.uniform(0, total_stake)
-        current = 0
-        for address, stake in self.stake_pool.items():
-            current += stake
-            if current > pick:
-                return address
-        return None
+        return self.stake_index.sample()
+    
+    def select_stakers(self, count):
+        return self.stake_index.sample_many(count)
     
     def stake_mine_block(self):
         staker = self.select_staker()
@@ -90,6 +369,234 @@ class Node:
             return staker
         return None
 
+# Желі симуляторы: дискретті оқиғалар сағаты, нақты күту жоқ
+BLOCK_HEADER_BYTES = 80
+TX_BYTES = 250
+
+class NetworkSimulator:
+    """Мыңдаған Node арасында блоктардың таралуын, майнингті және стейкингті модельдеу"""
+
+    def __init__(self, node_count=1000, degree=8, latency=(0.05, 0.3), bandwidth=1.25e6,
+                 block_interval=10.0, txs_per_block=2000, consensus="pow", finality_depth=6, seed=1):
+        self.rng = random.Random(seed)
+        self.block_interval = block_interval
+        self.txs_per_block = txs_per_block
+        self.consensus = consensus
+        self.finality_depth = finality_depth
+        self.block_bytes = BLOCK_HEADER_BYTES + txs_per_block * TX_BYTES
+        transfer = self.block_bytes / bandwidth  # Бір арнадан блокты жіберу уақыты
+        genesis = Block("0", [])
+        self.nodes = []
+        for node_id in range(node_count):
+            node = Node(node_id)
+            node.chain = [genesis]
+            self.nodes.append(node)
+        # Кездейсоқ граф: әр арнаның өз кідірісі бар (latency + өлшем / bandwidth)
+        self.peers = [[] for _ in range(node_count)]
+        for node_id in range(node_count):
+            for _ in range(max(1, degree // 2)):
+                other = self.rng.randrange(node_count)
+                if other != node_id:
+                    delay = self.rng.uniform(*latency) + transfer
+                    self.peers[node_id].append((other, delay))
+                    self.peers[other].append((node_id, delay))
+        self.stake_index = StakeIndex()
+        for node_id in range(node_count):
+            self.stake_index.stake(node_id, self.rng.randint(1, 100))
+        self.heights = {genesis.hash: 0}
+        self.parents = {}  # блок хэші -> ата-блок
+        self.created_at = {genesis.hash: 0.0}
+        self.seen = {genesis.hash: bytearray(b"\x01" * node_count)}
+        self.seen_count = {genesis.hash: node_count}
+        self.propagated_at = {genesis.hash: 0.0}
+        self.waiting = {}  # (node_id, ата-хэш) -> атасын күтіп тұрған блоктар
+        self.events = []
+        self.sequence = 0
+        self.now = 0.0
+        self.blocks_created = 0
+
+    def schedule(self, delay, kind, *data):
+        self.sequence += 1
+        heapq.heappush(self.events, (self.now + delay, self.sequence, kind, data))
+
+    def next_block_delay(self):
+        if self.consensus == "pos":
+            return self.block_interval  # Стейкингте блоктар тұрақты слот сайын
+        return self.rng.expovariate(1 / self.block_interval)  # PoW: Пуассон процесі
+
+    def produce_block(self):
+        if self.consensus == "pos":
+            producer = self.stake_index.sample(self.rng)
+        else:
+            producer = self.rng.randrange(len(self.nodes))
+        node = self.nodes[producer]
+        parent = node.chain[-1]
+        self.blocks_created += 1
+        # Уақыт белгісі бір сағат тиегінде сәйкес келуі мүмкін: nonce ретінде блок нөмірі хэштің бірегейлігін береді
+        block = Block(parent.hash, [], nonce=self.blocks_created)
+        self.parents[block.hash] = parent
+        self.heights[block.hash] = self.heights[parent.hash] + 1
+        self.created_at[block.hash] = self.now
+        self.seen[block.hash] = bytearray(len(self.nodes))
+        self.seen_count[block.hash] = 0
+        self.receive(producer, block)
+
+    def receive(self, node_id, block):
+        seen = self.seen[block.hash]
+        if seen[node_id]:
+            return
+        parent = self.parents[block.hash]
+        if not self.seen[parent.hash][node_id]:
+            # Ата-блок әлі келмеген: ол келгенше күтеміз
+            self.waiting.setdefault((node_id, parent.hash), []).append(block)
+            return
+        seen[node_id] = 1
+        self.seen_count[block.hash] += 1
+        if self.seen_count[block.hash] == len(self.nodes):
+            self.propagated_at[block.hash] = self.now
+        self.extend_chain(self.nodes[node_id], block)
+        for peer, delay in self.peers[node_id]:
+            if not seen[peer]:
+                self.schedule(delay, "deliver", peer, block)
+        for child in self.waiting.pop((node_id, block.hash), ()):
+            self.receive(node_id, child)
+
+    def extend_chain(self, node, block):
+        # Ең ұзын тізбек ережесі; тең болса бірінші келген блок қалады
+        height = self.heights[block.hash]
+        if height < len(node.chain):
+            return
+        branch = []
+        while height >= len(node.chain) or node.chain[height] is not block:
+            branch.append(block)
+            block = self.parents[block.hash]
+            height -= 1
+        del node.chain[height + 1:]
+        node.chain.extend(reversed(branch))
+
+    def run(self, duration=600.0):
+        self.schedule(self.next_block_delay(), "produce")
+        while self.events:
+            when, _, kind, data = heapq.heappop(self.events)
+            if when > duration:
+                break
+            self.now = when
+            if kind == "produce":
+                self.produce_block()
+                self.schedule(self.next_block_delay(), "produce")
+            else:
+                self.receive(*data)
+        self.now = duration
+        return self.report()
+
+    def report(self):
+        # Негізгі тізбек ретінде ең көп түйін қабылдаған ұш алынады
+        tips = {}
+        for node in self.nodes:
+            tips[node.chain[-1].hash] = tips.get(node.chain[-1].hash, 0) + 1
+        best = max(tips, key=lambda tip: (tips[tip], self.heights[tip]))
+        main_chain = next(node.chain for node in self.nodes if node.chain[-1].hash == best)
+        main_blocks = len(main_chain) - 1
+        finality = []
+        for height in range(1, len(main_chain) - self.finality_depth):
+            block = main_chain[height]
+            buried = main_chain[height + self.finality_depth]
+            if buried.hash in self.propagated_at:
+                finality.append(self.propagated_at[buried.hash] - self.created_at[block.hash])
+        propagation = [self.propagated_at[h] - self.created_at[h] for h in self.propagated_at if h in self.parents]
+        finality.sort()
+        propagation.sort()
+        return {
+            "nodes": len(self.nodes),
+            "simulated_seconds": self.now,
+            "blocks_created": self.blocks_created,
+            "main_chain_blocks": main_blocks,
+            "orphan_rate": 1 - main_blocks / self.blocks_created if self.blocks_created else 0.0,
+            "throughput_tps": main_blocks * self.txs_per_block / self.now,
+            "median_propagation": propagation[len(propagation) // 2] if propagation else None,
+            "median_finality": finality[len(finality) // 2] if finality else None,
+        }
+
+def run_simulation(node_count=10000, duration=600.0, consensus="pow"):
+    start = time.perf_counter()
+    simulator = NetworkSimulator(node_count=node_count, consensus=consensus)
+    report = simulator.run(duration)
+    report["wall_seconds"] = round(time.perf_counter() - start, 1)
+    print(report)
+    return report
+
+# Виртуалды тізім: тек көрінетін жолдар Listbox-қа жазылады
+class VirtualList(tk.Frame):
+    def __init__(self, master, render_row, width=100, height=20):
+        super().__init__(master)
+        self.render_row = render_row  # жол нөмірі -> мәтін
+        self.count = 0
+        self.top = 0  # Терезедегі бірінші жолдың нөмірі
+        self.height = height
+        self.listbox = tk.Listbox(self, width=width, height=height)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scroll)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.bind("<MouseWheel>", lambda event: self.scroll_to(self.top - event.delta // 120))
+        self.listbox.bind("<Button-4>", lambda event: self.scroll_to(self.top - 1))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll_to(self.top + 1))
+
+    def set_count(self, count):
+        """Жолдар санын жаңарту; терезе соңында тұрса, жаңа жолдарға ілеседі"""
+        at_end = self.top + self.height >= self.count
+        self.count = count
+        if at_end:
+            self.top = max(0, count - self.height)
+        self.refresh()
+
+    def refresh(self):
+        self.listbox.delete(0, tk.END)
+        for row in range(self.top, min(self.count, self.top + self.height)):
+            self.listbox.insert(tk.END, self.render_row(row))
+        if self.count:
+            self.scrollbar.set(self.top / self.count, min(1.0, (self.top + self.height) / self.count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, top):
+        self.top = max(0, min(top, self.count - self.height))
+        self.refresh()
+
+    def on_scroll(self, action, *args):
+        if action == tk.MOVETO:
+            self.scroll_to(int(float(args[0]) * self.count))
+        elif action == tk.SCROLL:
+            step = self.height if args[1] == tk.PAGES else 1
+            self.scroll_to(self.top + int(args[0]) * step)
+
+# Фондық майнинг: nonce іздеу бөлек ағында, нәтижелер кезек арқылы Tk циклына беріледі
+MINING_POLL_MS = 100
+
+class MiningWorker(threading.Thread):
+    def __init__(self, node, node_name, events):
+        super().__init__(daemon=True)
+        self.node = node
+        self.node_name = node_name
+        self.events = events
+        self.cancel_event = threading.Event()
+        # Ұш пен транзакциялардың көшірмесі Tk ағынында алынады
+        self.previous_hash = node.chain[-1].hash
+        self.transactions = list(node.pending_transactions)
+    
+    def report(self, nonce, hash_rate):
+        if self.cancel_event.is_set():
+            raise MiningCancelled
+        self.events.put(("progress", nonce, hash_rate))
+    
+    def run(self):
+        try:
+            with MINING_SECONDS.time():
+                block = self.node.solve_block(self.previous_hash, self.transactions, self.report)
+        except MiningCancelled:
+            self.events.put(("cancelled", None, None))
+            return
+        self.events.put(("mined", block, None))
+
 # GUI
 class BlockchainGUI:
     def __init__(self, root):
@@ -97,6 +604,11 @@ class BlockchainGUI:
         self.wallet = SigningKey.generate(curve=SECP256k1)
         self.public_key = self.wallet.verifying_key
         self.current_node = "Node 1"
+        self.root = root
+        self.mining_queue = deque()  # Кезектегі майнинг тапсырмалары (түйін аттары)
+        self.mining_worker = None
+        self.mining_events = queue.Queue()
+        self.row_offsets = {name: [0] for name in self.nodes}  # Әр блоктың бірінші жолының нөмірі
         
         root.title("Блокчейн")
         tk.Label(root, text="Түйіндер:").pack()
@@ -119,28 +631,48 @@ class BlockchainGUI:
         
         tk.Button(root, text="Транзакция Жіберу", command=self.send_transaction).pack()
         tk.Button(root, text="Майнинг Жүргізу", command=self.mine_block).pack()
+        tk.Button(root, text="Майнингті Тоқтату", command=self.cancel_mining).pack()
         tk.Button(root, text="Стейкингке Қатысу", command=self.stake_funds).pack()
         tk.Button(root, text="Стейкинг арқылы Майнинг", command=self.stake_mining).pack()
         
-        self.text_area = scrolledtext.ScrolledText(root, width=60, height=20)
-        self.text_area.pack()
+        self.mining_status = tk.StringVar(value="Майнинг жүріп жатқан жоқ")
+        tk.Label(root, textvariable=self.mining_status).pack()
+        
+        self.block_view = VirtualList(root, self.render_row, width=60, height=20)
+        self.block_view.pack()
         
         self.update_blockchain_view()
     
     def update_node(self, value):
         self.current_node = value
+        self.block_view.count = 0  # Жаңа түйіннің тізбегі соңынан көрсетіледі
         self.update_blockchain_view()
     
     def update_blockchain_view(self):
-        self.text_area.delete(1.0, tk.END)
         node = self.nodes[self.current_node]
-        for block in node.chain:
-            self.text_area.insert(tk.END, f"Блок хэші: {block.hash}\n")
-            self.text_area.insert(tk.END, f"Алдыңғы хэш: {block.previous_hash}\n")
-            self.text_area.insert(tk.END, "Транзакциялар:\n")
-            for tx in block.transactions:
-                self.text_area.insert(tk.END, f"  {tx.sender[:10]}... -> {tx.receiver[:10]}... : {tx.amount} BTC\n")
-            self.text_area.insert(tk.END, "-" * 50 + "\n")
+        offsets = self.row_offsets[self.current_node]
+        if len(offsets) > len(node.chain) + 1:
+            del offsets[1:]
+        # Тек жаңа блоктардың жолдары саналады
+        for block in node.chain[len(offsets) - 1:]:
+            offsets.append(offsets[-1] + len(block.transactions) + 4)
+        self.block_view.set_count(offsets[-1])
+    
+    def render_row(self, row):
+        offsets = self.row_offsets[self.current_node]
+        index = bisect_right(offsets, row) - 1
+        block = self.nodes[self.current_node].chain[index]
+        line = row - offsets[index]
+        if line == 0:
+            return f"Блок хэші: {block.hash}"
+        if line == 1:
+            return f"Алдыңғы хэш: {block.previous_hash}"
+        if line == 2:
+            return "Транзакциялар:"
+        if line - 3 < len(block.transactions):
+            tx = block.transactions[line - 3]
+            return f"  {tx.sender[:10]}... -> {tx.receiver[:10]}... : {tx.amount} BTC"
+        return "-" * 50
     
     def send_transaction(self):
         receiver = self.receiver_entry.get()
@@ -148,14 +680,53 @@ class BlockchainGUI:
         fee = int(self.fee_entry.get())
         tx = Transaction(self.public_key.to_string().hex(), receiver, amount, fee)
         tx.sign_transaction(self.wallet)
-        self.nodes[self.current_node].add_transaction(tx)
+        if not self.nodes[self.current_node].add_transaction(tx):
+            messagebox.showerror("Транзакция", "Қолтаңба жарамсыз!")
+            return
         messagebox.showinfo("Транзакция", "Транзакция сәтті жіберілді!")
         self.update_blockchain_view()
     
     def mine_block(self):
-        self.nodes[self.current_node].mine_block(self.public_key.to_string().hex())
-        messagebox.showinfo("Майнинг", "Блок табысты жасалды!")
-        self.update_blockchain_view()
+        self.mining_queue.append(self.current_node)
+        self.mining_status.set(f"Майнинг кезекке қойылды: {self.current_node} (кезекте: {len(self.mining_queue)})")
+        self.start_next_job()
+    
+    def start_next_job(self):
+        if self.mining_worker is not None or not self.mining_queue:
+            return
+        name = self.mining_queue.popleft()
+        self.mining_worker = MiningWorker(self.nodes[name], name, self.mining_events)
+        self.mining_worker.start()
+        self.root.after(MINING_POLL_MS, self.poll_mining)
+    
+    def poll_mining(self):
+        # Tk циклы бұғатталмайды: оқиғалар кезегі MINING_POLL_MS сайын тексеріледі
+        worker = self.mining_worker
+        while True:
+            try:
+                kind, value, hash_rate = self.mining_events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                self.mining_status.set(f"{worker.node_name}: nonce {value}, {hash_rate:,.0f} H/s (кезекте: {len(self.mining_queue)})")
+                continue
+            self.mining_worker = None
+            if kind == "cancelled":
+                self.mining_status.set("Майнинг тоқтатылды")
+            elif worker.node.commit_block(value, self.public_key.to_string().hex()):
+                self.mining_status.set(f"{worker.node_name}: блок табысты жасалды!")
+                if worker.node_name == self.current_node:
+                    self.update_blockchain_view()
+            else:
+                self.mining_status.set(f"{worker.node_name}: тізбек өзгерді, блок ескірді")
+            self.start_next_job()
+            return
+        self.root.after(MINING_POLL_MS, self.poll_mining)
+    
+    def cancel_mining(self):
+        self.mining_queue.clear()
+        if self.mining_worker is not None:
+            self.mining_worker.cancel_event.set()
     
     def stake_funds(self):
         amount = int(self.amount_entry.get())
@@ -170,6 +741,60 @@ class BlockchainGUI:
             messagebox.showinfo("Стейкинг Майнинг", "Стейк жетіспейді!")
         self.update_blockchain_view()
 
-root = tk.Tk()
-app = BlockchainGUI(root)
-root.mainloop()
\ No newline at end of file
+def benchmark_verification(count=2000, worker_counts=None):
+    """Секундына тексерулер саны (жалпы және бір ядроға шаққанда)"""
+    keys = [SigningKey.generate(curve=SECP256k1) for _ in range(16)]
+    transactions = []
+    for i in range(count):
+        key = keys[i % len(keys)]
+        tx = Transaction(key.verifying_key.to_string().hex(), "receiver", i, 1)
+        tx.sign_transaction(key)
+        transactions.append(tx)
+    for workers in worker_counts or sorted({1, os.cpu_count() or 1}):
+        verifier = TransactionVerifier(workers=workers)
+        verifier.verify(transactions[:verifier.chunk_size * workers + 1])  # Пулды қыздыру
+        start = time.perf_counter()
+        results = verifier.verify(transactions)
+        elapsed = time.perf_counter() - start
+        verifier.close()
+        assert all(results)
+        rate = count / elapsed
+        print(f"workers={workers}: {rate:,.0f} verifications/s, {rate / workers:,.0f} per core")
+
+# Жадты өлшеу: бастапқы __dict__ транзакциясы (hex tx_id жолымен) мен қазіргі __slots__ транзакциясы
+def _measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+def benchmark_memory(count=100000):
+    """Бір транзакцияға шаққандағы жад: __dict__ объектілері және __slots__ транзакциялары"""
+    senders = [f"user{i}" for i in range(count)]
+    transactions, slotted = _measure(lambda: [Transaction(senders[i], "receiver", i, 1) for i in range(count)])
+    fields = ("sender", "receiver", "amount", "fee", "timestamp", "tx_id", "signature")
+    _, dict_based = _measure(lambda: [SimpleNamespace(**{name: getattr(tx, name) for name in fields}) for tx in transactions])
+    print(f"__dict__ objects: {dict_based / count:.0f} B/transaction")
+    print(f"__slots__ Transaction: {slotted / count:.0f} B/transaction")
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_verification()
+        sys.exit(0)
+    if "--bench-memory" in sys.argv:
+        benchmark_memory()
+        sys.exit(0)
+    if "--check-stake" in sys.argv:
+        sys.exit(0 if check_stake_distribution() else 1)
+    if "--simulate" in sys.argv:
+        run_simulation(consensus="pos" if "--pos" in sys.argv else "pow")
+        sys.exit(0)
+    try:
+        start_http_server(METRICS_PORT)
+    except OSError as error:
+        print(f"Metrics exporter disabled: {error}")
+    root = tk.Tk()
+    app = BlockchainGUI(root)
+    root.mainloop()
\ No newline at end of file
@@ -0,0 +1,143 @@
+import sys
+import json
+import time
+import random
+import argparse
+
+import Blockchain_1lab1
+import Blockchain_1lab3
+import Blockchain_2lab
+import Blockchain_3lab
+import Blockchain_5lab
+import Blockchain_6lab
+
+# Барлық зертханалардың ыстық жолдарына арналған бенчмарктар.
+# Әр жағдай бірлікке шаққандағы ең жақсы уақытты (секунд) қайтарады, аз болған сайын жақсы.
+DEFAULT_THRESHOLD = 0.2  # Базалық мәннен 20%-дан көп баяулау регрессия саналады
+
+
+def bench_simple_hash(size):
+    strings = [f"record-{i}-" + "x" * 64 for i in range(size)]
+    start = time.perf_counter()
+    for s in strings:
+        Blockchain_1lab1.simple_hash(s)
+    return (time.perf_counter() - start) / size
+
+
+def bench_simple_hash_lab3(size):
+    strings = [f"record-{i}-" + "x" * 64 for i in range(size)]
+    start = time.perf_counter()
+    for s in strings:
+        Blockchain_3lab.simple_hash(s)
+    return (time.perf_counter() - start) / size
+
+
+def bench_merkle_tree(size):
+    transactions = [Blockchain_2lab.Transaction(f"user{i}", "receiver", i, 1) for i in range(size)]
+    start = time.perf_counter()
+    Blockchain_2lab.MerkleTree(transactions)
+    return (time.perf_counter() - start) / size
+
+
+def bench_mine_block(size):
+    # size - қиындық; nonce саны кездейсоқ болғандықтан, бір хэшке кеткен уақыт өлшенеді
+    start = time.perf_counter()
+    block = Blockchain_5lab.Block(1, "0" * 64, [], size, "bench")
+    return (time.perf_counter() - start) / block.nonce
+
+
+def bench_is_chain_valid(size):
+    blockchain = Blockchain_1lab3.Blockchain()
+    for i in range(size):
+        blockchain.add_block(Blockchain_1lab3.Block(i + 1, "timestamp", f"Block {i} Data"))
+    start = time.perf_counter()
+    assert blockchain.is_chain_valid()
+    return (time.perf_counter() - start) / size
+
+
+def bench_verify_signature(size):
+    wallet = Blockchain_3lab.Wallet()
+    items = []
+    for i in range(size):
+        tx = {"sender": "Alice", "recipient": "Bob", "amount": i}
+        items.append((tx, wallet.sign_transaction(tx)))
+    start = time.perf_counter()
+    for tx, signature in items:
+        assert Blockchain_3lab.Wallet.verify_signature(tx, signature, wallet.public_key)
+    return (time.perf_counter() - start) / size
+
+
+def bench_select_staker(size):
+    # size - стейкерлер саны; әр өлшемде 10000 таңдау жасалады
+    random.seed(size)
+    node = Blockchain_6lab.Node(0)
+    for i in range(size):
+        node.stake(f"addr{i}", random.randint(1, 1000))
+    draws = 10000
+    start = time.perf_counter()
+    for _ in range(draws):
+        node.select_staker()
+    return (time.perf_counter() - start) / draws
+
+
+BENCHMARKS = {
+    "simple_hash": (bench_simple_hash, (1000, 10000, 100000)),
+    "simple_hash_lab3": (bench_simple_hash_lab3, (1000, 10000, 100000)),
+    "merkle_tree": (bench_merkle_tree, (1000, 10000, 100000)),
+    "mine_block": (bench_mine_block, (3, 4)),
+    "is_chain_valid": (bench_is_chain_valid, (100, 1000, 10000)),
+    "verify_signature": (bench_verify_signature, (10, 100)),
+    "select_staker": (bench_select_staker, (10, 1000, 100000)),
+}
+
+
+def run(names=None, repeat=3):
+    """{"<аты>[<өлшем>]": секунд} түріндегі нәтижелер"""
+    results = {}
+    for name, (function, sizes) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for size in sizes:
+            key = f"{name}[{size}]"
+            results[key] = min(function(size) for _ in range(repeat))
+            print(f"{key}: {results[key] * 1e6:.3f} us/op", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Базалық мәннен threshold-тан көп баяулаған жағдайлар тізімі"""
+    regressions = []
+    for key, value in results.items():
+        base = baseline.get(key)
+        if base and value > base * (1 + threshold):
+            regressions.append((key, base, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Blockchain labs benchmark suite")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a stored JSON baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = run(args.only, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for key, base, value in regressions:
+            print(f"REGRESSION {key}: {base * 1e6:.3f} -> {value * 1e6:.3f} us/op ({value / base - 1:+.0%})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
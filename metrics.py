@@ -0,0 +1,151 @@
+import time
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Метрикалар тізілімі: санауыштар, өлшеуіштер және кідіріс гистограммалары (Prometheus мәтін форматы)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300)
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def samples(self, name, labels):
+        yield f"{name}{_format_labels(labels)} {self.value}"
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, function=None):
+        self.value = 0
+        self.function = function  # Берілсе, мән /metrics сұралғанда ғана есептеледі
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self, name, labels):
+        value = self.function() if self.function else self.value
+        yield f"{name}{_format_labels(labels)} {value}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.lock = threading.Lock()
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Соңғысы +Inf үшін
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        return _Timer(self)
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            yield f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}"
+        yield f"{name}_sum{_format_labels(labels)} {self.sum}"
+        yield f"{name}_count{_format_labels(labels)} {self.count}"
+
+
+class _Timer:
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        # Қатемен (мысалы, MiningCancelled) үзілген өлшемдер гистограмманы бұрмаламауы үшін жазылмайды
+        if exc_type is None:
+            self.histogram.observe(self.elapsed)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}  # аты -> (түрі, сипаттамасы, {белгілер: метрика})
+
+    def _get(self, cls, name, help_text, labels, **kwargs):
+        labels = tuple(sorted((labels or {}).items()))
+        with self.lock:
+            _, _, children = self.metrics.setdefault(name, (cls.kind, help_text, {}))
+            metric = children.get(labels)
+            if metric is None:
+                metric = children[labels] = cls(**kwargs)
+            return metric
+
+    def counter(self, name, help_text, labels=None):
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=None, function=None):
+        return self._get(Gauge, name, help_text, labels, function=function)
+
+    def histogram(self, name, help_text, labels=None, buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def render(self):
+        """Prometheus мәтін форматындағы экспорт"""
+        lines = []
+        with self.lock:
+            metrics = [(name, kind, help_text, list(children.items())) for name, (kind, help_text, children) in self.metrics.items()]
+        for name, kind, help_text, children in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in children:
+                lines.extend(metric.samples(name, labels))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def start_http_server(port, host="0.0.0.0", registry=REGISTRY):
+    """/metrics бағытын фондық ағында беретін шағын HTTP сервер (Flask-сыз GUI процестері үшін)"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # Әр scrape сұрауы консольге жазылмайды
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server